@@ -1,3 +1,14 @@
+import contextlib
+import os
+import pickle
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
 class Cache:
     """In-memory cache for API responses."""
 
@@ -62,6 +73,81 @@ class Cache:
         self._company_news_cache[ticker] = self._merge_data(self._company_news_cache.get(ticker), data, key_field="date")
 
 
+class DiskCache:
+    """Pickle-backed on-disk cache that survives across processes.
+
+    With max_age (in seconds), the first write of each instance deletes entries last
+    written longer ago than that, so caches keyed by day or hour don't grow without bound.
+    """
+
+    def __init__(self, namespace: str, max_age: float | None = None):
+        root = os.environ.get("HEDGE_FUND_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "ai-hedge-fund")
+        self._dir = os.path.join(root, namespace)
+        self._max_age = max_age
+        self._pruned = max_age is None
+
+    def _path(self, key: tuple[str, ...]) -> str:
+        return os.path.join(self._dir, "-".join(part.replace(os.sep, "_") for part in key) + ".pkl")
+
+    def get(self, *key: str) -> any:
+        """Get a cached value, or None if nothing readable is stored under the key."""
+        try:
+            with open(self._path(key), "rb") as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def set(self, *key: str, value: any):
+        """Store a value, writing to a temp file first so readers never see a partial pickle."""
+        if not self._pruned:
+            self._pruned = True
+            self._prune()
+        os.makedirs(self._dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def _prune(self):
+        """Delete entries (and leftover temp files) older than max_age.
+
+        Lock files are kept: their mtime doesn't change while they are in use, and
+        deleting one under a holder would let the next caller lock a new file.
+        """
+        cutoff = time.time() - self._max_age
+        try:
+            entries = list(os.scandir(self._dir))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.name.endswith(".lock"):
+                continue
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+    @contextlib.contextmanager
+    def lock(self, *key: str):
+        """Hold an exclusive lock on a key across threads and processes.
+
+        Where fcntl is unavailable (Windows) this doesn't lock, and concurrent
+        writers fall back to last-write-wins.
+        """
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(self._dir, exist_ok=True)
+        with open(self._path(key) + ".lock", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
 # Global cache instance
 _cache = Cache()
 
@@ -9,6 +9,16 @@ class Price(BaseModel):
     volume: int
     time: str
 
+    @classmethod
+    def from_arrays(cls, open, close, high, low, volume, time, validate: bool = True) -> list["Price"]:
+        """Build one Price per row of parallel columns, given as lists or NumPy arrays.
+
+        With validate=False the values are trusted as-is and built with model_construct.
+        """
+        columns = [column.tolist() if hasattr(column, "tolist") else column for column in (open, close, high, low, volume, time)]
+        build = cls if validate else cls.model_construct
+        return [build(open=o, close=c, high=h, low=l, volume=v, time=t) for o, c, h, l, v, t in zip(*columns)]
+
 
 class PriceResponse(BaseModel):
     ticker: str
@@ -3,6 +3,7 @@ import os
 import pandas as pd
 import requests
 from dotenv import load_dotenv
+from pydantic import TypeAdapter
 
 from src.data.cache import get_cache
 from src.data.models import (
@@ -28,6 +29,12 @@ load_dotenv()
 # Global cache instance
 _cache = get_cache()
 
+# Serialize whole result lists in one call rather than a model_dump() per item
+_PRICE_LIST_ADAPTER = TypeAdapter(list[Price])
+_FM_LIST_ADAPTER = TypeAdapter(list[FinancialMetrics])
+_INSIDER_TRADE_LIST_ADAPTER = TypeAdapter(list[InsiderTrade])
+_COMPANY_NEWS_LIST_ADAPTER = TypeAdapter(list[CompanyNews])
+
 def _using_yahoo_finance() -> bool:
     """Check if we're using Yahoo Finance API instead of Financial Datasets API."""
     api_key = os.environ.get("FINANCIAL_DATASETS_API_KEY")
@@ -64,7 +71,7 @@ def get_prices(ticker: str, start_date: str, end_date: str) -> list[Price]:
         return []
 
     # Cache the results as dicts
-    _cache.set_prices(ticker, [p.model_dump() for p in prices])
+    _cache.set_prices(ticker, _PRICE_LIST_ADAPTER.dump_python(prices))
     return prices
 
 
@@ -105,7 +112,7 @@ def get_financial_metrics(
         return []
 
     # Cache the results as dicts
-    _cache.set_financial_metrics(ticker, [m.model_dump() for m in financial_metrics])
+    _cache.set_financial_metrics(ticker, _FM_LIST_ADAPTER.dump_python(financial_metrics))
     return financial_metrics
 
 
@@ -207,7 +214,7 @@ def get_insider_trades(
         return []
 
     # Cache the results
-    _cache.set_insider_trades(ticker, [trade.model_dump() for trade in all_trades])
+    _cache.set_insider_trades(ticker, _INSIDER_TRADE_LIST_ADAPTER.dump_python(all_trades))
     return all_trades
 
 
@@ -270,7 +277,7 @@ def get_company_news(
         return []
 
     # Cache the results
-    _cache.set_company_news(ticker, [news.model_dump() for news in all_news])
+    _cache.set_company_news(ticker, _COMPANY_NEWS_LIST_ADAPTER.dump_python(all_news))
     return all_news
 
 
@@ -312,7 +319,7 @@ def get_market_cap(
 
 def prices_to_df(prices: list[Price]) -> pd.DataFrame:
     """Convert prices to a DataFrame."""
-    df = pd.DataFrame([p.model_dump() for p in prices])
+    df = pd.DataFrame(_PRICE_LIST_ADAPTER.dump_python(prices))
     df["Date"] = pd.to_datetime(df["time"])
     df.set_index("Date", inplace=True)
     numeric_cols = ["open", "close", "high", "low", "volume"]
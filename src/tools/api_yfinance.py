@@ -2,13 +2,24 @@
 Yahoo Finance API integration for the AI Hedge Fund project.
 This module provides functions to retrieve financial data from Yahoo Finance.
 """
+import asyncio
 import datetime
+import functools
+import logging
 import os
+import random
+import threading
+import time
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, wait
 import yfinance as yf
+from curl_cffi import requests as curl_requests
+from curl_cffi.requests.exceptions import ConnectionError as _ConnectionError, Timeout as _Timeout
+from yfinance.exceptions import YFRateLimitError, YFTickerMissingError
 from typing import Union, Literal
 
-from src.data.cache import get_cache
+from src.data.cache import DiskCache, get_cache
 from src.data.models import (
     CompanyNews,
     FinancialMetrics,
@@ -17,9 +28,532 @@ from src.data.models import (
     InsiderTrade,
 )
 
+logger = logging.getLogger(__name__)
+
 # Global cache instance
 _cache = get_cache()
 
+# One HTTP session shared by every yfinance call, so connections (and their TLS
+# handshakes) are reused instead of each Ticker opening its own. yfinance >= 0.2.55
+# only accepts curl_cffi sessions, which impersonate a browser, and depends on curl_cffi.
+_SESSION = curl_requests.Session(impersonate="chrome")
+
+# Failures worth retrying: rate limits and network errors of the session in use
+_TRANSIENT_ERRORS = (YFRateLimitError, _ConnectionError, _Timeout)
+
+# Defaults for the multi-ticker batch functions
+_BATCH_THREADS = 8
+_BATCH_TIMEOUT = 60  # seconds to wait for any single ticker
+_ASYNC_CONCURRENCY = 8
+
+# Most Yahoo requests in flight at once across all threads; Yahoo starts answering
+# with 429s when many more run in parallel
+_MAX_CONCURRENT_REQUESTS = 8
+_request_slots = threading.BoundedSemaphore(_MAX_CONCURRENT_REQUESTS)
+
+# Retries for transient failures, backing off exponentially with jitter
+_TRANSIENT_RETRIES = 3
+_RETRY_BACKOFF = 2.0  # seconds before the first retry
+
+# Most symbols to put in one Yahoo request, keeping multi-symbol URLs within Yahoo's limits
+_SYMBOLS_PER_REQUEST = 20
+
+# Yahoo's quote endpoint returns a handful of fields for many symbols per request
+_QUOTE_URL = "https://query1.finance.yahoo.com/v7/finance/quote"
+
+# On-disk cache for yf.Ticker attributes, so a fresh process can reload today's data without HTTP.
+# Entries are keyed by day, so anything written more than a day ago is never read again
+_disk_cache = DiskCache("yf", max_age=24 * 3600)
+
+# Non-empty yf.Ticker attributes by (ticker, attr), along with the day they were fetched;
+# a new day replaces the entry, so both maps stay bounded by tickers times attributes
+_ticker_attrs: dict[tuple[str, str], tuple[str, object]] = {}
+
+# One lock per (ticker, attr), so concurrent callers missing the same key fetch it once
+_fetch_locks: dict[tuple[str, str], threading.Lock] = {}
+
+# Bars are split- and dividend-adjusted, and every new split or dividend changes the
+# adjustment of all earlier bars; stored frames are downloaded again once they are this
+# many days old, or as soon as an extension brings in a split or dividend
+_PRICE_STORE_MAX_AGE = 7  # days
+_ACTION_COLUMNS = ["Dividends", "Stock Splits"]
+
+# On-disk OHLCV frames per ticker, along with the date range they cover; frames past
+# their refresh age are only ever replaced, so they are pruned from disk as well
+_price_disk_cache = DiskCache("yf-prices", max_age=_PRICE_STORE_MAX_AGE * 24 * 3600)
+_PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# Date ranges whose prices went into _cache, per ticker, so partial overlaps aren't served as hits
+_cached_price_ranges: dict[str, list[tuple[str, str]]] = {}
+
+# Fields of the Price model, in the order the price helpers emit them
+_PRICE_FIELDS = ("open", "close", "high", "low", "volume", "time")
+
+# Prices, metrics and news are built from values we already cast, so skip Pydantic's
+# per-field validation unless HEDGE_FUND_STRICT_VALIDATION=1 asks for it
+_SKIP_VALIDATION = os.environ.get("HEDGE_FUND_STRICT_VALIDATION", "0") != "1"
+
+
+class YFinanceTransientError(Exception):
+    """Yahoo Finance kept failing with a rate limit or network error after all retries."""
+
+
+def _with_retry(fetch, description: str):
+    """Call fetch(), retrying _TRANSIENT_ERRORS with exponential backoff.
+
+    Each attempt holds one of the _MAX_CONCURRENT_REQUESTS request slots, which are
+    released while backing off so other callers can proceed.
+
+    Raises YFinanceTransientError, chained to the last failure, once the retries run out.
+    Any other exception propagates unchanged on the first attempt.
+    """
+    for attempt in range(_TRANSIENT_RETRIES + 1):
+        try:
+            with _request_slots:
+                return fetch()
+        except _TRANSIENT_ERRORS as e:
+            if attempt == _TRANSIENT_RETRIES:
+                raise YFinanceTransientError(f"Yahoo Finance failed fetching {description}: {e}") from e
+            delay = _RETRY_BACKOFF * 2 ** attempt + random.random()
+            logger.warning("Transient error from Yahoo Finance fetching %s, retrying in %.1fs: %s", description, delay, e)
+            time.sleep(delay)
+
+
+def _as_float(value) -> float | None:
+    """Cast a numeric JSON value to float, mapping anything else (None, strings) to None."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return None
+
+
+def _build(model, data: dict):
+    """Construct a model from pre-validated data, validating only in strict mode."""
+    return model.model_construct(**data) if _SKIP_VALIDATION else model(**data)
+
+
+@functools.lru_cache(maxsize=512)
+def _ticker(ticker: str, day: str) -> yf.Ticker:
+    """Shared yf.Ticker per symbol and day, so its lazily loaded data is reused but not kept stale."""
+    return yf.Ticker(ticker, session=_SESSION)
+
+
+def _ticker_attr(ticker: str, attr: str, day: str):
+    """Fetch a yf.Ticker attribute at most once per ticker and day.
+
+    The in-memory map makes repeat calls within a process a dict hit; the disk cache
+    makes the first call in a new process a pickle read instead of a network round-trip.
+    Empty responses are usually transient fetch failures, so neither layer keeps them
+    and the next call fetches again. Callers share the returned object and must not mutate it.
+    """
+    key = (ticker, attr)
+    memo = _ticker_attrs.get(key)
+    if memo is not None and memo[0] == day:
+        return memo[1]
+
+    # Serialize threads that miss together and re-check both caches once the lock is held
+    with _fetch_locks.setdefault(key, threading.Lock()):
+        memo = _ticker_attrs.get(key)
+        if memo is not None and memo[0] == day:
+            return memo[1]
+        value = _disk_cache.get(ticker, attr, day)
+        if value is None:
+            value = _with_retry(lambda: getattr(_ticker(ticker, day), attr), f"{attr} for {ticker}")
+            if value is None or len(value) == 0:
+                return value
+            _disk_cache.set(ticker, attr, day, value=value)
+        _ticker_attrs[key] = (day, value)
+    return value
+
+
+def _today() -> str:
+    return datetime.date.today().strftime("%Y-%m-%d")
+
+
+@functools.lru_cache(maxsize=1024)
+def _norm_date(date: str) -> str:
+    """Normalize a date string to YYYY-MM-DD, parsing each distinct input only once."""
+    return pd.to_datetime(date).strftime("%Y-%m-%d")
+
+
+def _info(ticker: str) -> dict:
+    return _ticker_attr(ticker, "info", _today())
+
+
+def _financials(ticker: str) -> pd.DataFrame:
+    """Income statement (yfinance exposes the same data as both `financials` and `income_stmt`)."""
+    return _ticker_attr(ticker, "financials", _today())
+
+
+def _balance_sheet(ticker: str) -> pd.DataFrame:
+    return _ticker_attr(ticker, "balance_sheet", _today())
+
+
+def _cashflow(ticker: str) -> pd.DataFrame:
+    return _ticker_attr(ticker, "cashflow", _today())
+
+
+# Map FinancialMetrics fields to the ticker info keys that provide them directly
+_INFO_TO_METRIC: dict[str, str] = {
+    "market_cap": "marketCap",
+    "enterprise_value": "enterpriseValue",
+    "price_to_earnings_ratio": "trailingPE",
+    "price_to_book_ratio": "priceToBook",
+    "price_to_sales_ratio": "priceToSalesTrailing12Months",
+    "enterprise_value_to_ebitda_ratio": "enterpriseToEbitda",
+    "peg_ratio": "pegRatio",
+    "gross_margin": "grossMargins",
+    "operating_margin": "operatingMargins",
+    "net_margin": "profitMargins",
+    "return_on_equity": "returnOnEquity",
+    "return_on_assets": "returnOnAssets",
+    "current_ratio": "currentRatio",
+    "quick_ratio": "quickRatio",
+    "debt_to_equity": "debtToEquity",
+    "revenue_growth": "revenueGrowth",
+    "earnings_per_share_growth": "earningsQuarterlyGrowth",
+    "payout_ratio": "payoutRatio",
+    "earnings_per_share": "trailingEps",
+    "book_value_per_share": "bookValue",
+}
+
+# FinancialMetrics fields that identify an entry rather than carry a metric
+_METRIC_KEY_FIELDS = ("ticker", "report_period", "period", "currency")
+
+# Ticker attributes that may hold insider data, most likely to succeed first. Only
+# those the installed yfinance version defines are kept, checked once on the class.
+_INSIDER_ATTRS = tuple(
+    attr_name
+    for attr_name in ("insider_transactions", "insider_roster", "insiders")
+    if hasattr(yf.Ticker, attr_name)
+)
+
+# Statement fetchers by the statement ids used in _LINE_ITEM_TO_STATEMENT
+_STATEMENT_FETCHERS = {
+    "income": _financials,
+    "balance": _balance_sheet,
+    "cash_flow": _cashflow,
+}
+
+# Map common line items to the Yahoo Finance row name and the statement holding it.
+# The statement properties return yfinance's "pretty" row labels ("Total Revenue",
+# "EBIT", "Basic EPS"), not the camelCase keys of Yahoo's raw API.
+# This mapping follows Financial Datasets API's line item naming convention
+_LINE_ITEM_TO_STATEMENT: dict[str, tuple[str, str]] = {
+    # Income Statement items
+    "revenue": ("Total Revenue", "income"),
+    "revenue_usd": ("Total Revenue", "income"),  # Same as revenue but in USD
+    "cost_of_revenue": ("Cost Of Revenue", "income"),
+    "gross_profit": ("Gross Profit", "income"),
+    "operating_expense": ("Operating Expense", "income"),
+    "operating_income": ("Operating Income", "income"),
+    "interest_expense": ("Interest Expense", "income"),
+    "ebit": ("EBIT", "income"),
+    "ebitda": ("EBITDA", "income"),
+    "income_tax_expense": ("Tax Provision", "income"),
+    "net_income": ("Net Income", "income"),
+    "net_income_common_stock": ("Net Income Common Stockholders", "income"),
+    "earnings_per_share": ("Basic EPS", "income"),
+    "earnings_per_share_diluted": ("Diluted EPS", "income"),
+    "consolidated_income": ("Total Revenue", "income"),  # Using total revenue as proxy
+    "research_and_development": ("Research And Development", "income"),
+    "selling_general_and_administrative_expenses": ("Selling General And Administration", "income"),
+
+    # Balance Sheet items
+    "cash": ("Cash And Cash Equivalents", "balance"),
+    "total_assets": ("Total Assets", "balance"),
+    "total_liabilities": ("Total Liabilities Net Minority Interest", "balance"),
+    "total_equity": ("Stockholders Equity", "balance"),
+    "total_debt": ("Total Debt", "balance"),
+    "accounts_payable": ("Accounts Payable", "balance"),
+    "accounts_receivable": ("Accounts Receivable", "balance"),
+    "inventory": ("Inventory", "balance"),
+    "current_assets": ("Current Assets", "balance"),
+    "current_liabilities": ("Current Liabilities", "balance"),
+    "long_term_debt": ("Long Term Debt", "balance"),
+
+    # Cash Flow items
+    "free_cash_flow": ("Free Cash Flow", "cash_flow"),
+    "operating_cash_flow": ("Operating Cash Flow", "cash_flow"),
+    "capital_expenditure": ("Capital Expenditure", "cash_flow"),
+    "cash_dividends_paid": ("Cash Dividends Paid", "cash_flow"),
+    "issuance_of_stock": ("Issuance Of Capital Stock", "cash_flow"),
+    "repurchase_of_stock": ("Repurchase Of Capital Stock", "cash_flow"),
+}
+
+# FinancialMetrics fields the info may lack, derived as numerator / |denominator| * scale
+# from the latest report. Inputs are line items, plus "market_cap" and "shares_outstanding" from info.
+_DERIVED_RATIOS: dict[str, tuple[str, str, float]] = {
+    "free_cash_flow_yield": ("free_cash_flow", "market_cap", 1.0),
+    "free_cash_flow_per_share": ("free_cash_flow", "shares_outstanding", 1.0),
+    "debt_to_assets": ("total_debt", "total_assets", 1.0),
+    "interest_coverage": ("ebit", "interest_expense", 1.0),
+    "asset_turnover": ("revenue", "total_assets", 1.0),
+    "inventory_turnover": ("cost_of_revenue", "inventory", 1.0),
+    "receivables_turnover": ("revenue", "accounts_receivable", 1.0),
+    "days_sales_outstanding": ("accounts_receivable", "revenue", 365.0),
+    "cash_ratio": ("cash", "current_liabilities", 1.0),
+    "operating_cash_flow_ratio": ("operating_cash_flow", "current_liabilities", 1.0),
+}
+
+# FinancialMetrics growth fields derived from a line item's two most recent reports
+_DERIVED_GROWTH: dict[str, str] = {
+    "revenue_growth": "revenue",
+    "earnings_growth": "net_income",
+    "operating_income_growth": "operating_income",
+    "ebitda_growth": "ebitda",
+    "free_cash_flow_growth": "free_cash_flow",
+    "book_value_growth": "total_equity",
+}
+
+
+def _fetch_statement(fetch, ticker: str) -> pd.DataFrame:
+    """Fetch one financial statement, falling back to an empty frame on failure."""
+    try:
+        statement = fetch(ticker)
+    except Exception as e:
+        logger.warning("Could not retrieve financial statement for %s: %s", ticker, e)
+        return pd.DataFrame()
+    return statement if statement is not None else pd.DataFrame()
+
+
+def _derived_inputs_by_statement() -> dict[str, list[tuple[str, str]]]:
+    """The line items the derived metrics read, as (item, row name) pairs per statement id."""
+    inputs = {item for numerator, denominator, _ in _DERIVED_RATIOS.values() for item in (numerator, denominator)}
+    inputs.update(_DERIVED_GROWTH.values())
+    items_by_statement: dict[str, list[tuple[str, str]]] = {}
+    for item_name in sorted(inputs & _LINE_ITEM_TO_STATEMENT.keys()):
+        yf_name, statement_id = _LINE_ITEM_TO_STATEMENT[item_name]
+        items_by_statement.setdefault(statement_id, []).append((item_name, yf_name))
+    return items_by_statement
+
+
+def _derive_metrics(ticker: str, info: dict, end_date: str) -> dict[str, float | None]:
+    """Compute the _DERIVED_RATIOS and _DERIVED_GROWTH metrics from the ticker's financial statements."""
+    needed = list(_derived_inputs_by_statement())
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        statements = dict(zip(needed, executor.map(_fetch_statement, [_STATEMENT_FETCHERS[statement_id] for statement_id in needed], [ticker] * len(needed))))
+    return _metrics_from_statements(statements, info, end_date)
+
+
+def _metrics_from_statements(statements: dict[str, pd.DataFrame], info: dict, end_date: str) -> dict[str, float | None]:
+    """Compute the derived metrics from statement frames keyed by statement id.
+
+    Only reports dated on or before end_date are used. Metrics whose inputs are
+    unavailable, or whose denominator is zero, come back as None.
+    """
+    items_by_statement = _derived_inputs_by_statement()
+
+    # Latest and prior report value of every input, NaN where unavailable
+    latest = {"market_cap": info.get("marketCap"), "shares_outstanding": info.get("sharesOutstanding")}
+    prior: dict[str, float] = {}
+    for statement_id, items in items_by_statement.items():
+        statement = statements.get(statement_id, pd.DataFrame())
+        if statement.empty:
+            continue
+        statement = statement[~statement.index.duplicated()]
+        report_dates = pd.to_datetime(statement.columns, errors="coerce")
+        order = np.argsort(report_dates.to_numpy())[::-1]
+        order = order[report_dates.to_numpy()[order] <= np.datetime64(end_date)][:2]
+        values = np.full((len(items), 2), np.nan)
+        values[:, :len(order)] = statement.iloc[:, order].reindex([yf_name for _, yf_name in items]).to_numpy(dtype="float64", na_value=np.nan)
+        for (item_name, _), (latest_value, prior_value) in zip(items, values):
+            latest[item_name] = latest_value
+            prior[item_name] = prior_value
+
+    # Evaluate every ratio, then every growth rate, as one array operation each
+    numerators = np.array([latest.get(numerator) for numerator, _, _ in _DERIVED_RATIOS.values()], dtype="float64")
+    denominators = np.abs(np.array([latest.get(denominator) for _, denominator, _ in _DERIVED_RATIOS.values()], dtype="float64"))
+    scales = np.array([scale for _, _, scale in _DERIVED_RATIOS.values()])
+    ratios = np.divide(numerators, denominators, out=np.full_like(numerators, np.nan), where=denominators != 0) * scales
+
+    current = np.array([latest.get(item) for item in _DERIVED_GROWTH.values()], dtype="float64")
+    previous = np.array([prior.get(item) for item in _DERIVED_GROWTH.values()], dtype="float64")
+    growth = np.divide(current - previous, np.abs(previous), out=np.full_like(current, np.nan), where=previous != 0)
+
+    derived = dict(zip(_DERIVED_RATIOS, ratios.tolist())) | dict(zip(_DERIVED_GROWTH, growth.tolist()))
+    return {field: None if np.isnan(value) else value for field, value in derived.items()}
+
+
+def _iso_dates(index: pd.DatetimeIndex) -> np.ndarray:
+    """Format a DatetimeIndex as YYYY-MM-DD strings in one vectorized call."""
+    # Drop any timezone first, keeping wall-clock dates rather than shifting them to UTC
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return np.datetime_as_string(index.values.astype("datetime64[D]"))
+
+
+def _price_arrays_from_frame(data: pd.DataFrame) -> dict[str, np.ndarray]:
+    """Extract the Price fields of a single-ticker yfinance OHLCV frame as column arrays."""
+    # Newer yfinance versions return (field, ticker) MultiIndex columns even for a
+    # single ticker; drop the ticker level once so every column below is a plain
+    # Series, without mutating the caller's frame
+    if isinstance(data.columns, pd.MultiIndex):
+        data = data.droplevel(1, axis=1)
+
+    # Extract whole columns as typed arrays instead of boxing every row into a Series
+    return {
+        "open": data['Open'].to_numpy(dtype='float64'),
+        "close": data['Close'].to_numpy(dtype='float64'),
+        "high": data['High'].to_numpy(dtype='float64'),
+        "low": data['Low'].to_numpy(dtype='float64'),
+        "volume": data['Volume'].to_numpy(dtype='int64'),
+        "time": _iso_dates(data.index),
+    }
+
+
+def _price_columns(arrays: dict[str, np.ndarray]) -> dict[str, list]:
+    """Unbox price column arrays into lists of Python values, once per download.
+
+    Price objects and cache rows built from the same lists share their value objects,
+    rather than each holding its own copy of every float and date string.
+    """
+    return {field: arrays[field].tolist() for field in _PRICE_FIELDS}
+
+
+def _price_rows(columns: dict[str, list]) -> list[dict[str, any]]:
+    """Convert price columns into Price-shaped dicts for the cache.
+
+    Building them from the columns means the cache write doesn't need a model_dump()
+    pass over the constructed models.
+    """
+    # Format the data to match the Price model, walking the columns in lockstep
+    return [dict(zip(_PRICE_FIELDS, values)) for values in zip(*columns.values())]
+
+
+def _cached_price_rows(ticker: str, start_date: str, end_date: str) -> list[dict[str, any]] | None:
+    """Get cached price rows within the date range, or None unless a download cached here covered all of it.
+
+    The cache only holds trading days, so its rows alone can't tell a range that was
+    fetched from one that merely overlaps an earlier fetch.
+    """
+    start_date, end_date = _norm_date(start_date), _norm_date(end_date)
+    if not any(start <= start_date and end_date <= end for start, end in _cached_price_ranges.get(ticker, ())):
+        return None
+    # The cache appends rows in download order, so a backwards extension lands after later days
+    rows = [price for price in _cache.get_prices(ticker) or [] if start_date <= price["time"] <= end_date]
+    return sorted(rows, key=lambda price: price["time"])
+
+
+def _cached_prices(ticker: str, start_date: str, end_date: str) -> list[Price]:
+    """Get cached prices within the date range, or an empty list on a cache miss."""
+    return [_build(Price, price) for price in _cached_price_rows(ticker, start_date, end_date) or []]
+
+
+def _cache_prices(ticker: str, start_date: str, end_date: str, rows: list[dict[str, any]]) -> None:
+    """Add downloaded price rows to the cache, recording the date range they cover."""
+    _cache.set_prices(ticker, rows)
+    if _cached_price_rows(ticker, start_date, end_date) is None:
+        _cached_price_ranges.setdefault(ticker, []).append((_norm_date(start_date), _norm_date(end_date)))
+
+
+def _shift_day(date: str, days: int) -> str:
+    return (datetime.date.fromisoformat(date) + datetime.timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def _yf_download(ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+    """Download daily OHLCV bars for one ticker from Yahoo Finance, with end_date inclusive."""
+    # Convert dates to datetime objects for yfinance
+    start_date_dt = pd.to_datetime(start_date)
+    end_date_dt = pd.to_datetime(end_date)
+
+    # Add one day to end_date to include it in the results
+    end_date_dt = end_date_dt + pd.Timedelta(days=1)
+
+    # Get split- and dividend-adjusted bars from Yahoo Finance, as yf.download returns
+    # by default; auto_adjust is pinned so a yfinance upgrade can't change that. The
+    # splits and dividends in the range come along so _download_prices can tell when
+    # stored bars went stale. Ticker.history is used rather than yf.download, which
+    # swallows rate limits and network errors into an empty frame: with raise_errors
+    # they reach _with_retry, and only a range without any bars comes back empty.
+    try:
+        data = _with_retry(
+            lambda: _ticker(ticker, _today()).history(start=start_date_dt, end=end_date_dt, auto_adjust=True, actions=True, raise_errors=True),
+            f"prices for {ticker}",
+        )
+    except YFTickerMissingError:
+        return pd.DataFrame(columns=_PRICE_COLUMNS)
+
+    # Match yf.download's daily bars, which are indexed by naive exchange dates
+    if getattr(data.index, "tz", None) is not None:
+        data.index = data.index.tz_localize(None)
+    return data
+
+
+def _stored_prices(ticker: str) -> dict | None:
+    """The ticker's stored bars, or None when there are none or they are due a refresh."""
+    stored = _price_disk_cache.get(ticker)
+    if stored is None or stored.get("fetched", "") < _shift_day(_today(), -_PRICE_STORE_MAX_AGE):
+        return None
+    return stored
+
+
+def _has_corporate_actions(data: pd.DataFrame) -> bool:
+    """Whether any bar in a frame from _yf_download carries a split or dividend."""
+    return any((data[column].fillna(0) != 0).any() for column in _ACTION_COLUMNS if column in data.columns)
+
+
+def _download_prices(ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+    """Get daily OHLCV bars for one ticker, with end_date inclusive.
+
+    Completed trading days are kept on disk per ticker, so a range that was already
+    downloaded is sliced from the stored frame instead of being fetched again, and a
+    range that extends the stored one only downloads the days it adds. The stored
+    frame is refreshed as described at _PRICE_STORE_MAX_AGE.
+    """
+    start_date, end_date = _norm_date(start_date), _norm_date(end_date)
+    stored = _stored_prices(ticker)
+    if stored is not None and stored["start"] <= start_date and end_date <= stored["end"]:
+        return stored["data"].loc[start_date:end_date]
+
+    # Hold the ticker's lock while fetching, so concurrent runs download the range once
+    with _price_disk_cache.lock(ticker):
+        stored = _stored_prices(ticker)
+        if stored is not None and stored["start"] <= start_date and end_date <= stored["end"]:
+            return stored["data"].loc[start_date:end_date]
+
+        # When the request touches the stored range, only fetch the days on either side of it.
+        # Failed downloads raise, so an empty side range is a real answer (a weekend, a
+        # holiday) and still widens the stored range, keeping it from being fetched again.
+        # A request that doesn't touch the stored range and has no bars isn't stored, so
+        # it can't replace a stored frame that has some.
+        yesterday = _shift_day(_today(), -1)
+        fetched = _today()
+        contiguous = stored is not None and start_date <= _shift_day(stored["end"], 1) and end_date >= _shift_day(stored["start"], -1)
+        if contiguous:
+            frames = [stored["data"]]
+            covered_start, covered_end = stored["start"], stored["end"]
+            after = None
+            if start_date < stored["start"]:
+                frames.append(_yf_download(ticker, start_date, _shift_day(stored["start"], -1)))
+                covered_start = start_date
+            if end_date > stored["end"]:
+                after = _yf_download(ticker, _shift_day(stored["end"], 1), end_date)
+                frames.append(after)
+                covered_end = max(covered_end, min(end_date, yesterday))
+            if after is not None and _has_corporate_actions(after):
+                # A split or dividend went ex after the stored bars, so their adjustment
+                # is stale; download the whole range again instead of patching it
+                data = _yf_download(ticker, covered_start, end_date)
+            else:
+                fetched = stored["fetched"]
+                data = pd.concat([frame for frame in frames if not frame.empty])
+                data = data[~data.index.duplicated(keep="last")].sort_index()
+        else:
+            data = _yf_download(ticker, start_date, end_date)
+            if data.empty:
+                return data
+            covered_start, covered_end = start_date, min(end_date, yesterday)
+        data = data[_PRICE_COLUMNS]
+
+        # Only persist completed sessions, today's bar can still change; skip the
+        # write when no download added to the stored range
+        unchanged = contiguous and fetched == stored["fetched"] and (covered_start, covered_end) == (stored["start"], stored["end"])
+        if covered_start <= covered_end and not unchanged:
+            _price_disk_cache.set(ticker, value={"start": covered_start, "end": covered_end, "fetched": fetched, "data": data.loc[:covered_end]})
+
+    return data.loc[start_date:end_date]
+
+
 def get_prices(ticker: str, start_date: str, end_date: str) -> list[Price]:
     """Fetch price data from Yahoo Finance API.
 
@@ -37,45 +571,73 @@ def get_prices(ticker: str, start_date: str, end_date: str) -> list[Price]:
         List of Price objects with standardized fields matching Financial Datasets API,
         or empty list if data is unavailable or an error occurred
     """
-    try:
-        # Convert dates to datetime objects for yfinance
-        start_date_dt = pd.to_datetime(start_date)
-        end_date_dt = pd.to_datetime(end_date)
-
-        # Add one day to end_date to include it in the results
-        end_date_dt = end_date_dt + pd.Timedelta(days=1)
+    # Check cache first
+    if cached_prices := _cached_prices(ticker, start_date, end_date):
+        return cached_prices
 
-        # Get data from Yahoo Finance
-        data = yf.download(ticker, start=start_date_dt, end=end_date_dt)
+    try:
+        data = _download_prices(ticker, start_date, end_date)
 
         if data.empty:
             return []
 
-        # Format the data to match the Price model
-        prices = []
-        for date, row in data.iterrows():
-            # Handle both Series and single value scenarios
-            price = Price(
-                open=float(row['Open'].iloc[0]) if hasattr(row['Open'], 'iloc') else float(row['Open']),
-                close=float(row['Close'].iloc[0]) if hasattr(row['Close'], 'iloc') else float(row['Close']),
-                high=float(row['High'].iloc[0]) if hasattr(row['High'], 'iloc') else float(row['High']),
-                low=float(row['Low'].iloc[0]) if hasattr(row['Low'], 'iloc') else float(row['Low']),
-                volume=int(row['Volume'].iloc[0]) if hasattr(row['Volume'], 'iloc') else int(row['Volume']),
-                time=date.strftime('%Y-%m-%d')
-            )
-            prices.append(price)
+        columns = _price_columns(_price_arrays_from_frame(data))
+        prices = Price.from_arrays(**columns, validate=not _SKIP_VALIDATION)
 
         # Cache the results in the same format as Financial Datasets API
-        _cache.set_prices(ticker, [p.model_dump() for p in prices])
+        _cache_prices(ticker, start_date, end_date, _price_rows(columns))
 
         # Return the prices directly, matching the return type of Financial Datasets API function
         return prices
     except Exception as e:
-        print(f"Warning: Error fetching price data from Yahoo Finance for {ticker}: {str(e)}")
+        logger.warning("Error fetching price data from Yahoo Finance for %s: %s", ticker, e)
         # Return empty list on error to avoid breaking the API
         return []
 
 
+def get_prices_arrays(ticker: str, start_date: str, end_date: str) -> dict[str, np.ndarray] | None:
+    """Fetch price data from Yahoo Finance as column arrays rather than Price objects.
+
+    Meant for vectorized consumers (returns, rolling windows) that would otherwise
+    rebuild arrays from a list of Price objects. Shares the price cache with get_prices.
+
+    Args:
+        ticker: The stock ticker symbol
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format
+
+    Returns:
+        Dict mapping each Price field ("open", "close", "high", "low", "volume", "time")
+        to a NumPy array, or None if data is unavailable or an error occurred
+    """
+    # Check cache first
+    if rows := _cached_price_rows(ticker, start_date, end_date):
+        return {
+            "open": np.fromiter((row["open"] for row in rows), dtype="float64", count=len(rows)),
+            "close": np.fromiter((row["close"] for row in rows), dtype="float64", count=len(rows)),
+            "high": np.fromiter((row["high"] for row in rows), dtype="float64", count=len(rows)),
+            "low": np.fromiter((row["low"] for row in rows), dtype="float64", count=len(rows)),
+            "volume": np.fromiter((row["volume"] for row in rows), dtype="int64", count=len(rows)),
+            "time": np.array([row["time"] for row in rows]),
+        }
+
+    try:
+        data = _download_prices(ticker, start_date, end_date)
+
+        if data.empty:
+            return None
+
+        arrays = _price_arrays_from_frame(data)
+
+        # Keep get_prices callers served from the same download
+        _cache_prices(ticker, start_date, end_date, _price_rows(_price_columns(arrays)))
+
+        return arrays
+    except Exception as e:
+        logger.warning("Error fetching price data from Yahoo Finance for %s: %s", ticker, e)
+        return None
+
+
 def get_financial_metrics(
     ticker: str,
     end_date: str,
@@ -101,87 +663,65 @@ def get_financial_metrics(
         List of FinancialMetrics objects with standardized fields matching Financial Datasets API,
         or empty list if data is unavailable or an error occurred
     """
-    try:
-        # Get ticker info
-        ticker_obj = yf.Ticker(ticker)
+    # Check cache first. Each entry is a snapshot derived as of its report_period, so
+    # only one taken for this exact end_date answers the call
+    if cached_data := _cache.get_financial_metrics(ticker):
+        filtered_data = [_build(FinancialMetrics, metric) for metric in cached_data if metric["period"] == period and metric["report_period"] == _norm_date(end_date)]
+        if filtered_data:
+            return filtered_data[:limit]
 
+    try:
         # Get financial data
-        info = ticker_obj.info
-        financials = ticker_obj.financials
-        balance_sheet = ticker_obj.balance_sheet
-        cash_flow = ticker_obj.cashflow
+        info = _info(ticker)
 
         # Get current date for report period
-        current_date = pd.to_datetime(end_date).strftime("%Y-%m-%d")
+        current_date = _norm_date(end_date)
 
-        # Calculate financial metrics
-        market_cap = info.get('marketCap')
-        enterprise_value = info.get('enterpriseValue')
-
-        # Extract common financial metrics
-        metrics = []
-
-        # Create basic FinancialMetrics object with all required fields
-        financial_metric = FinancialMetrics(
+        # Collect all required FinancialMetrics fields; the dict is both the
+        # constructor kwargs and the cache entry. Metrics Yahoo doesn't provide stay None.
+        fm_dict = dict.fromkeys(FinancialMetrics.model_fields)
+        fm_dict.update(
             ticker=ticker,
             report_period=current_date,
             period=period,
             currency="USD",  # Yahoo Finance typically reports in USD
-            market_cap=market_cap,
-            enterprise_value=enterprise_value,
-            price_to_earnings_ratio=info.get('trailingPE'),
-            price_to_book_ratio=info.get('priceToBook'),
-            price_to_sales_ratio=info.get('priceToSalesTrailing12Months'),
-            enterprise_value_to_ebitda_ratio=info.get('enterpriseToEbitda'),
-            enterprise_value_to_revenue_ratio=None,  # Not directly provided by Yahoo
-            free_cash_flow_yield=None,  # Need to calculate
-            peg_ratio=info.get('pegRatio'),
-            gross_margin=info.get('grossMargins'),
-            operating_margin=info.get('operatingMargins'),
-            net_margin=info.get('profitMargins'),
-            return_on_equity=info.get('returnOnEquity'),
-            return_on_assets=info.get('returnOnAssets'),
-            return_on_invested_capital=None,  # Not directly provided
-            asset_turnover=None,  # Not directly provided
-            inventory_turnover=None,  # Not directly provided
-            receivables_turnover=None,  # Not directly provided
-            days_sales_outstanding=None,  # Not directly provided
-            operating_cycle=None,  # Not directly provided
-            working_capital_turnover=None,  # Not directly provided
-            current_ratio=info.get('currentRatio'),
-            quick_ratio=info.get('quickRatio'),
-            cash_ratio=None,  # Not directly provided
-            operating_cash_flow_ratio=None,  # Not directly provided
-            debt_to_equity=info.get('debtToEquity'),
-            debt_to_assets=None,  # Not directly provided
-            interest_coverage=None,  # Not directly provided
-            revenue_growth=info.get('revenueGrowth'),
-            earnings_growth=None,  # Not directly provided
-            book_value_growth=None,  # Not directly provided
-            earnings_per_share_growth=info.get('earningsQuarterlyGrowth'),
-            free_cash_flow_growth=None,  # Not directly provided
-            operating_income_growth=None,  # Not directly provided
-            ebitda_growth=None,  # Not directly provided
-            payout_ratio=info.get('payoutRatio'),
-            earnings_per_share=info.get('trailingEps'),
-            book_value_per_share=info.get('bookValue'),
-            free_cash_flow_per_share=None  # Not directly provided
         )
+        # Info values are raw JSON numbers (market cap and enterprise value come as ints),
+        # so cast them here; the model is built without validation
+        fm_dict.update({field: _as_float(info.get(info_key)) for field, info_key in _INFO_TO_METRIC.items()})
 
-        metrics.append(financial_metric)
+        # Fill in what the info lacks from the financial statements
+        derived = _derive_metrics(ticker, info, current_date)
+        fm_dict.update({field: value for field, value in derived.items() if fm_dict[field] is None})
 
-        # Cache the results in the same format as Financial Datasets API
-        _cache.set_financial_metrics(ticker, [m.model_dump() for m in metrics])
+        metrics = [_build(FinancialMetrics, fm_dict)]
+
+        # Cache the results in the same format as Financial Datasets API, unless no metric
+        # came back at all, which usually means the info fetch failed and is worth retrying
+        if any(fm_dict[field] is not None for field in FinancialMetrics.model_fields if field not in _METRIC_KEY_FIELDS):
+            _cache.set_financial_metrics(ticker, [fm_dict])
 
         # Return the metrics directly, matching the return type of Financial Datasets API function
         # The Financial Datasets API returns a list of FinancialMetrics objects
         return metrics[:limit]
     except Exception as e:
-        print(f"Warning: Error fetching financial metrics from Yahoo Finance for {ticker}: {str(e)}")
+        logger.warning("Error fetching financial metrics from Yahoo Finance for %s: %s", ticker, e)
         # Return empty list on error to avoid breaking the API
         return []
 
 
+def _news_in_range(news_items: list[dict], start_date: str | None, end_date: str) -> list[CompanyNews]:
+    """Build the news items published within the date range, most recent first.
+
+    Items are dated to the second and the range by day, so only the day is compared.
+    """
+    start_date = start_date and _norm_date(start_date)
+    end_date = _norm_date(end_date)
+    news_items = [news for news in news_items if (start_date is None or news["date"][:10] >= start_date) and news["date"][:10] <= end_date]
+    news_items.sort(key=lambda news: news["date"], reverse=True)
+    return [_build(CompanyNews, news) for news in news_items]
+
+
 def get_company_news(
     ticker: str,
     end_date: str,
@@ -205,48 +745,51 @@ def get_company_news(
     Returns:
         List of CompanyNews objects with standardized fields matching Financial Datasets API
     """
+    # Check cache first
+    if cached_data := _cache.get_company_news(ticker):
+        if filtered_data := _news_in_range(cached_data, start_date, end_date):
+            return filtered_data[:limit]
+
     try:
         # Get ticker info and news
-        ticker_obj = yf.Ticker(ticker)
+        ticker_obj = _ticker(ticker, _today())
         news_data = ticker_obj.news
 
         # Check if we have any news
         if not news_data:
-            print(f"Warning: No news data available for {ticker}")
+            logger.warning("No news data available for %s", ticker)
             return []
 
-        # Process the news data
-        news_items = []
-        for item in news_data[:limit]:  # Limit the number of news items
-            # Convert timestamp to ISO format date (same format as Financial Datasets API)
-            timestamp = item.get('providerPublishTime')
-            if timestamp:
-                date = datetime.datetime.fromtimestamp(timestamp).strftime("%Y-%m-%dT%H:%M:%S")
-            else:
-                date = datetime.datetime.now().strftime("%Y-%m-%dT%H:%M:%S")  # Use current date as fallback
-
-            # Get title and ensure it's not empty
-            title = item.get('title', '')
-            if not title:
-                title = f"News for {ticker} on {date}"  # Provide a default title
+        # Convert all timestamps to ISO format dates (same format as Financial Datasets API)
+        # in one vectorized call, using the current date as fallback for missing ones; the
+        # epoch timestamps convert to UTC, so the fallback is taken in UTC as well
+        timestamps = np.array([item.get('providerPublishTime') or 0 for item in news_data], dtype='int64')
+        dates = pd.to_datetime(timestamps, unit='s').strftime("%Y-%m-%dT%H:%M:%S").to_numpy()
+        dates[timestamps == 0] = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
 
-            # Create CompanyNews object that matches Financial Datasets API format
-            news = CompanyNews(
+        # Collect fields in the Financial Datasets API CompanyNews format, in one pass
+        news_items = [
+            dict(
                 ticker=ticker,
-                title=title,
+                title=item.get('title') or f"News for {ticker} on {date}",  # Provide a default title
                 author=item.get('publisher', 'Unknown'),
                 source=item.get('publisher', 'Yahoo Finance'),
                 date=date,
                 url=item.get('link', ''),
                 sentiment=None  # Yahoo doesn't provide sentiment, Financial Datasets might
             )
-            news_items.append(news)
+            for item, date in zip(news_data, dates.tolist())
+        ]
 
-        # Return news items in the same format as Financial Datasets API
+        # Cache the results in the same format as Financial Datasets API
+        _cache.set_company_news(ticker, news_items)
+
+        # Return news items in the same format as Financial Datasets API, filtered
+        # like a cache hit so both return the same items
         # The Financial Datasets API returns a list of CompanyNews objects
-        return news_items
+        return _news_in_range(news_items, start_date, end_date)[:limit]
     except Exception as e:
-        print(f"Error fetching news from Yahoo Finance for {ticker}: {str(e)}")
+        logger.warning("Error fetching news from Yahoo Finance for %s: %s", ticker, e)
         return []  # Return empty list on error to avoid breaking the API
 
 
@@ -274,120 +817,99 @@ def search_line_items(
         limit: Maximum number of results to return per ticker
 
     Returns:
-        List of LineItem objects containing the requested financial metrics
+        List of LineItem objects, one per report period (most recent first),
+        containing the requested financial metrics
     """
     try:
-        # Get ticker info
-        ticker_obj = yf.Ticker(ticker)
+        # Group the requested line items by the statement they come from
+        items_by_statement: dict[str, list[tuple[str, str]]] = {}
+        for item_name in line_items:
+            if item_name in _LINE_ITEM_TO_STATEMENT:
+                yf_name, statement_id = _LINE_ITEM_TO_STATEMENT[item_name]
+                items_by_statement.setdefault(statement_id, []).append((item_name, yf_name))
 
-        # Get financial statements
-        try:
-            income_stmt = ticker_obj.income_stmt
-            balance_sheet = ticker_obj.balance_sheet
-            cash_flow = ticker_obj.cashflow
-        except Exception as e:
-            print(f"Warning: Could not retrieve financial statements for {ticker}: {str(e)}")
-            return []
+        # Only fetch the statements that hold a requested line item; they are
+        # independent round-trips, so fetch them concurrently
+        needed = list(items_by_statement)
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            fetched = executor.map(_fetch_statement, [_STATEMENT_FETCHERS[statement_id] for statement_id in needed], [ticker] * len(needed))
+            statements = dict(zip(needed, fetched))
 
         # Check if any financial data is available
-        if income_stmt.empty and balance_sheet.empty and cash_flow.empty:
-            print(f"Warning: No financial data available for {ticker}")
+        if needed and all(statement.empty for statement in statements.values()):
+            logger.warning("No financial data available for %s", ticker)
             return []
 
-        # Map common line items to Yahoo Finance data
-        # This mapping follows Financial Datasets API's line item naming convention
-        line_item_mapping = {
-            # Income Statement items
-            "revenue": ("totalRevenue", income_stmt),
-            "revenue_usd": ("totalRevenue", income_stmt),  # Same as revenue but in USD
-            "cost_of_revenue": ("costOfRevenue", income_stmt),
-            "gross_profit": ("grossProfit", income_stmt),
-            "operating_expense": ("totalOperatingExpenses", income_stmt),
-            "operating_income": ("operatingIncome", income_stmt),
-            "interest_expense": ("interestExpense", income_stmt),
-            "ebit": ("ebit", income_stmt),
-            "ebitda": ("ebitda", income_stmt),
-            "income_tax_expense": ("incomeTaxExpense", income_stmt),
-            "net_income": ("netIncome", income_stmt),
-            "net_income_common_stock": ("netIncomeApplicableToCommonShares", income_stmt),
-            "earnings_per_share": ("basicEPS", income_stmt),
-            "earnings_per_share_diluted": ("dilutedEPS", income_stmt),
-            "consolidated_income": ("totalRevenue", income_stmt),  # Using total revenue as proxy
-            "research_and_development": ("researchDevelopment", income_stmt),
-            "selling_general_and_administrative_expenses": ("sellingGeneralAdministrative", income_stmt),
-
-            # Balance Sheet items
-            "cash": ("cash", balance_sheet),
-            "total_assets": ("totalAssets", balance_sheet),
-            "total_liabilities": ("totalLiab", balance_sheet),
-            "total_equity": ("totalStockholderEquity", balance_sheet),
-            "total_debt": ("totalDebt", balance_sheet),
-            "accounts_payable": ("accountsPayable", balance_sheet),
-            "accounts_receivable": ("netReceivables", balance_sheet),
-            "inventory": ("inventory", balance_sheet),
-            "current_assets": ("totalCurrentAssets", balance_sheet),
-            "current_liabilities": ("totalCurrentLiabilities", balance_sheet),
-            "long_term_debt": ("longTermDebt", balance_sheet),
-
-            # Cash Flow items
-            "free_cash_flow": ("freeCashFlow", cash_flow),
-            "operating_cash_flow": ("totalCashFromOperatingActivities", cash_flow),
-            "capital_expenditure": ("capitalExpenditures", cash_flow),
-            "cash_dividends_paid": ("dividendsPaid", cash_flow),
-            "issuance_of_stock": ("issuanceOfStock", cash_flow),
-            "repurchase_of_stock": ("repurchaseOfStock", cash_flow),
-        }
-
-        # Get the appropriate financial statement based on period
-        # For quarterly data, we'd use quarterlyReports if available
-        # For annual data, use annual reports
-        # For ttm (trailing twelve months), use the most recent data
-
-        results = []
-        current_date = pd.to_datetime(end_date).strftime("%Y-%m-%d")
+        current_date = _norm_date(end_date)
+
+        # Gather every requested row of a statement in one reindex, giving an
+        # (items x report periods) array, and spread it into per-period values
+        values_by_period: dict[str, dict[str, float | None]] = {}
+        found: set[str] = set()
+        for statement_id, items in items_by_statement.items():
+            statement = statements[statement_id]
+            if statement.empty:
+                continue
+            statement = statement[~statement.index.duplicated()]
+            values = statement.reindex([yf_name for _, yf_name in items]).to_numpy(dtype="float64", na_value=np.nan)
+            # Note which items have a value in any period, for the missing-items report below
+            found.update(item_name for (item_name, _), present in zip(items, ~np.isnan(values).all(axis=1)) if present)
+            # Transpose to one list per report period, with NaN cells turned into None
+            period_columns = np.where(np.isnan(values), None, values).T.tolist()
+            report_dates = pd.to_datetime(statement.columns, errors="coerce").strftime("%Y-%m-%d").fillna(current_date)
+            item_names = [item_name for item_name, _ in items]
+            for report_date, column in zip(report_dates, period_columns):
+                values_by_period.setdefault(report_date, {}).update(zip(item_names, column))
+
+        # Report all line items we couldn't find in a single message
+        missing = [item_name for item_name in line_items if item_name not in found]
+        if missing:
+            logger.warning("Could not retrieve %d line items for %s: %s", len(missing), ticker, missing)
+        if not found:
+            return []
 
-        # Get values for requested line items
-        for item_name in line_items:
-            if item_name in line_item_mapping:
-                yf_name, statement = line_item_mapping[item_name]
-
-                # Try to get the value
-                try:
-                    if hasattr(statement, 'index') and yf_name in statement.index:
-                        # Get the most recent value (first column)
-                        value = statement.loc[yf_name].iloc[0]
-
-                        # Use the statement date if available
-                        report_date = current_date
-                        if hasattr(statement, 'columns') and len(statement.columns) > 0:
-                            try:
-                                # Try to use the actual report date from the statement
-                                report_date = statement.columns[0].strftime('%Y-%m-%d')
-                            except (AttributeError, TypeError):
-                                # Fall back to current date if conversion fails
-                                pass
-
-                        # Create LineItem object
-                        line_item = LineItem(
-                            ticker=ticker,
-                            report_period=report_date,
-                            period=period,  # Use provided period
-                            currency="USD",  # Yahoo Finance typically reports in USD
-                            **{item_name: float(value) if not pd.isna(value) else None}
-                        )
-                        results.append(line_item)
-                except Exception as e:
-                    # Skip this item if we can't get it
-                    print(f"Warning: Could not retrieve {item_name} for {ticker}: {str(e)}")
-                    continue
+        # One LineItem per report period (most recent first) carrying every requested
+        # line item, like the Financial Datasets API; unavailable items are None, and
+        # periods without any requested value are left out
+        results = [
+            LineItem(
+                ticker=ticker,
+                report_period=report_date,
+                period=period,  # Use provided period
+                currency="USD",  # Yahoo Finance typically reports in USD
+                **{item_name: values_by_period[report_date].get(item_name) for item_name in line_items}
+            )
+            for report_date in sorted(values_by_period, reverse=True)
+            if report_date <= current_date and any(value is not None for value in values_by_period[report_date].values())
+        ]
 
         # Return limited results, matching Financial Datasets API behavior
         return results[:limit]
     except Exception as e:
-        print(f"Error fetching line items from Yahoo Finance for {ticker}: {str(e)}")
+        logger.warning("Error fetching line items from Yahoo Finance for %s: %s", ticker, e)
         return []  # Return empty list on error to avoid breaking the API
 
 
+@functools.lru_cache(maxsize=1)
+def _warn_insider_trades_unsupported():
+    """Log that insider trades are unsupported once per process, not once per ticker."""
+    logger.warning("Insider trades data is not supported by the installed yfinance version (%s)", yf.__version__)
+
+
+def _signed_shares(record: dict) -> float | None:
+    """Return the traded shares of an insider record, negative for sales.
+
+    yfinance reports Shares unsigned and describes the trade in the Transaction or
+    Text column (e.g. "Sale at price 150.00 per share."), while the agents read a
+    negative transaction_shares as a sale, like the Financial Datasets API.
+    """
+    shares = record.get("Shares")
+    if shares is None:
+        return None
+    description = f"{record.get('Transaction') or ''} {record.get('Text') or ''}".lower()
+    return -abs(shares) if "sale" in description else shares
+
+
 def get_insider_trades(
     ticker: str,
     end_date: str,
@@ -415,66 +937,88 @@ def get_insider_trades(
     Returns:
         List of InsiderTrade objects with standardized fields matching Financial Datasets API
     """
+    # Check cache first
+    if cached_data := _cache.get_insider_trades(ticker):
+        # Filter cached data by date range
+        filtered_data = [InsiderTrade(**trade) for trade in cached_data if (start_date is None or (trade.get("transaction_date") or trade["filing_date"]) >= start_date) and (trade.get("transaction_date") or trade["filing_date"]) <= end_date]
+        filtered_data.sort(key=lambda x: x.transaction_date or x.filing_date, reverse=True)
+        if filtered_data:
+            return filtered_data[:limit]
+
+    # Without any insider attribute there is nothing to fetch for any ticker
+    if not _INSIDER_ATTRS:
+        _warn_insider_trades_unsupported()
+        return []
+
     try:
         # Get ticker info
-        ticker_obj = yf.Ticker(ticker)
+        ticker_obj = _ticker(ticker, _today())
 
         # In current versions of yfinance, insider trades might be accessible through different attributes
         # We'll try multiple potential sources
         insider_data = None
 
-        # Try known possible attribute names
-        for attr_name in ["insiders", "insider_transactions", "insider_roster", "institutional_holders"]:
-            if hasattr(ticker_obj, attr_name):
-                insider_data = getattr(ticker_obj, attr_name)
-                if insider_data is not None and not (hasattr(insider_data, "empty") and insider_data.empty):
-                    break
+        # Try known possible attribute names; a single getattr per name, since every
+        # access on a Ticker may trigger a fetch and hasattr would repeat it
+        for attr_name in _INSIDER_ATTRS:
+            insider_data = getattr(ticker_obj, attr_name, None)
+            if insider_data is not None and not (hasattr(insider_data, "empty") and insider_data.empty):
+                break
 
         # If we found insider data, process it
         if insider_data is not None and len(insider_data) > 0:
-            trades = []
+            if not isinstance(insider_data, pd.DataFrame):
+                insider_data = pd.DataFrame(insider_data)
+
+            # Filter by filing date with one vectorized mask instead of per-row comparisons;
+            # rows without a usable date default to the current date
+            now_str = datetime.datetime.now().strftime("%Y-%m-%d")
+            date_column = next((c for c in ("Start Date", "Date") if c in insider_data.columns), None)
+            if date_column:
+                filing_dates = pd.to_datetime(insider_data[date_column], errors="coerce").dt.strftime("%Y-%m-%d").fillna(now_str)
+            else:
+                filing_dates = pd.Series(now_str, index=insider_data.index)
+            mask = filing_dates <= _norm_date(end_date)
+            if start_date:
+                mask &= filing_dates >= _norm_date(start_date)
 
-            # Process the data based on the format provided by yfinance
-            # This will need to be adapted if/when yfinance provides insider trade data
-            for idx, data in enumerate(insider_data):
-                # Filter by date if needed
-                filing_date = datetime.datetime.now().strftime("%Y-%m-%d")  # Default to current date
+            # Respect the limit parameter, and turn NaN cells into None for the model
+            filtered = insider_data.assign(filing_date=filing_dates)[mask].head(limit)
+            filtered = filtered.astype(object).where(filtered.notna(), None)
 
-                # Skip if outside date range
-                if start_date and filing_date < start_date:
-                    continue
-                if filing_date > end_date:
-                    continue
+            # The issuer is the same for every trade, look it up once
+            issuer = _info(ticker).get("shortName")
 
-                # Create an InsiderTrade object that matches the Financial Datasets API format
-                trade = InsiderTrade(
+            # Collect fields in the Financial Datasets API InsiderTrade format
+            trades = [
+                dict(
                     ticker=ticker,
-                    issuer=ticker_obj.info.get("shortName", None),
-                    name="Not Available",  # yfinance doesn't provide this detail
-                    title="Not Available",  # yfinance doesn't provide this detail
+                    issuer=issuer,
+                    name=record.get("Insider") or "Not Available",
+                    title=record.get("Position") or "Not Available",
                     is_board_director=None,  # yfinance doesn't provide this detail
-                    transaction_date=None,  # yfinance doesn't provide this detail
-                    transaction_shares=float(data.get("position", 0)) if isinstance(data, dict) else 0,
+                    transaction_date=record["filing_date"] if date_column else None,
+                    transaction_shares=_signed_shares(record),
                     transaction_price_per_share=None,  # yfinance doesn't provide this detail
-                    transaction_value=None,  # yfinance doesn't provide this detail
+                    transaction_value=record.get("Value"),
                     shares_owned_before_transaction=None,  # yfinance doesn't provide this detail
                     shares_owned_after_transaction=None,  # yfinance doesn't provide this detail
                     security_title="Common Stock",  # Default assumption
-                    filing_date=filing_date
+                    filing_date=record["filing_date"]
                 )
-                trades.append(trade)
-
-                # Respect the limit parameter
-                if len(trades) >= limit:
-                    break
+                for record in filtered.to_dict("records")
+            ]
 
-            return trades
+            # Cache the results in the same format as Financial Datasets API
+            if trades:
+                _cache.set_insider_trades(ticker, trades)
+            return [InsiderTrade(**trade) for trade in trades]
 
-        # If we reach here, the feature is not available or no data was found
-        print(f"WARNING: Insider trades data is not supported in the current Yahoo Finance API version for {ticker}")
-        return []  # Return empty list - this is expected behavior for unsupported features
+        # If we reach here, no data was found for this ticker
+        logger.warning("No insider trades data available from Yahoo Finance for %s", ticker)
+        return []
     except Exception as e:
-        print(f"WARNING: Error fetching insider trades from Yahoo Finance for {ticker}: {str(e)}")
+        logger.warning("Error fetching insider trades from Yahoo Finance for %s: %s", ticker, e)
         return []  # Return empty list on error to avoid breaking the API
 
 
@@ -493,10 +1037,15 @@ def get_market_cap(ticker: str, end_date: str) -> float | None:
     Returns:
         Market capitalization as a float or None if not available
     """
+    # Reuse the market cap of metrics already fetched for this ticker, most recent first
+    if cached_data := _cache.get_financial_metrics(ticker):
+        market_caps = [(metric["report_period"], metric["market_cap"]) for metric in cached_data if metric.get("market_cap") and metric["report_period"] <= end_date]
+        if market_caps:
+            return float(max(market_caps)[1])
+
     try:
         # Get ticker info
-        ticker_obj = yf.Ticker(ticker)
-        info = ticker_obj.info
+        info = _info(ticker)
 
         # Extract market cap
         market_cap = info.get("marketCap")
@@ -504,6 +1053,207 @@ def get_market_cap(ticker: str, end_date: str) -> float | None:
         # Convert to float if available, otherwise return None
         return float(market_cap) if market_cap else None
     except Exception as e:
-        print(f"Warning: Error fetching market cap from Yahoo Finance for {ticker}: {str(e)}")
+        logger.warning("Error fetching market cap from Yahoo Finance for %s: %s", ticker, e)
         # Return None instead of raising an exception to match Financial Datasets API behavior
         return None
+
+
+def _fan_out(fn, tickers: list[str], *args, threads: int = _BATCH_THREADS, timeout: float = _BATCH_TIMEOUT, default=None) -> dict:
+    """Call fn(ticker, *args) for every ticker on a thread pool.
+
+    The work is network-bound, so threads overlap the HTTP latency of each ticker.
+    A ticker that fails, or hasn't finished once `timeout` seconds have passed for the
+    whole batch, gets `default` instead of failing or holding up the rest.
+    """
+    executor = ThreadPoolExecutor(max_workers=threads)
+    try:
+        futures = {ticker: executor.submit(fn, ticker, *args) for ticker in tickers}
+        wait(futures.values(), timeout=timeout)
+        results = {}
+        for ticker, future in futures.items():
+            if not future.done():
+                logger.warning("Timed out after %ss fetching %s from Yahoo Finance for %s", timeout, fn.__name__, ticker)
+                results[ticker] = default
+            elif (e := future.exception()) is not None:
+                logger.warning("Error fetching %s from Yahoo Finance for %s: %s", fn.__name__, ticker, e)
+                results[ticker] = default
+            else:
+                results[ticker] = future.result()
+        return results
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_prices_batch(tickers: list[str], start_date: str, end_date: str) -> dict[str, list[Price]]:
+    """Fetch price data for several tickers with one yf.download call per chunk of symbols.
+
+    yfinance downloads the symbols concurrently and returns one wide frame grouped
+    by ticker, which is split back into per-ticker Price lists here.
+
+    Args:
+        tickers: The stock ticker symbols
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format
+
+    Returns:
+        Dict mapping each ticker to its list of Price objects (empty if unavailable)
+    """
+    # Serve what we can from the cache and only download the rest
+    results = {ticker: _cached_prices(ticker, start_date, end_date) for ticker in tickers}
+    missing = [ticker for ticker, prices in results.items() if not prices]
+    if not missing:
+        return results
+
+    start_date_dt = pd.to_datetime(start_date)
+    end_date_dt = pd.to_datetime(end_date) + pd.Timedelta(days=1)
+
+    # Download in chunks of symbols, so one failed request only loses its own chunk
+    for i in range(0, len(missing), _SYMBOLS_PER_REQUEST):
+        chunk = missing[i:i + _SYMBOLS_PER_REQUEST]
+        try:
+            with _request_slots:
+                data = yf.download(chunk, start=start_date_dt, end=end_date_dt, group_by="ticker", threads=True, progress=False, auto_adjust=True, session=_SESSION)
+            if data.empty:
+                continue
+
+            # Older yfinance versions return flat columns when only one symbol is requested
+            if not isinstance(data.columns, pd.MultiIndex):
+                data = pd.concat({chunk[0]: data}, axis=1)
+
+            for ticker in chunk:
+                if ticker not in data.columns.get_level_values(0):
+                    continue
+                # Drop bars with any missing field, a NaN Volume can't be cast to int64
+                ticker_data = data[ticker].dropna(subset=_PRICE_COLUMNS)
+                if ticker_data.empty:
+                    continue
+                columns = _price_columns(_price_arrays_from_frame(ticker_data))
+                _cache_prices(ticker, start_date, end_date, _price_rows(columns))
+                results[ticker] = Price.from_arrays(**columns, validate=not _SKIP_VALIDATION)
+        except Exception as e:
+            logger.warning("Error fetching batch price data from Yahoo Finance for %s: %s", chunk, e)
+
+    # yf.download reports rate limits and network errors as missing symbols, so fetch
+    # those one at a time through get_prices, whose downloads retry transient failures
+    for ticker in missing:
+        if not results[ticker]:
+            results[ticker] = get_prices(ticker, start_date, end_date)
+    return results
+
+
+def get_financial_metrics_batch(
+    tickers: list[str],
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+) -> dict[str, list[FinancialMetrics]]:
+    """Fetch financial metrics for several tickers concurrently."""
+    return _fan_out(get_financial_metrics, tickers, end_date, period, limit, default=[])
+
+
+def get_company_news_batch(
+    tickers: list[str],
+    end_date: str,
+    start_date: str | None = None,
+    limit: int = 10,
+) -> dict[str, list[CompanyNews]]:
+    """Fetch company news for several tickers concurrently."""
+    return _fan_out(get_company_news, tickers, end_date, start_date, limit, default=[])
+
+
+def search_line_items_batch(
+    tickers: list[str],
+    line_items: list[str],
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+) -> dict[str, list[LineItem]]:
+    """Fetch financial line items for several tickers concurrently."""
+    return _fan_out(search_line_items, tickers, line_items, end_date, period, limit, default=[])
+
+
+def get_insider_trades_batch(
+    tickers: list[str],
+    end_date: str,
+    start_date: str | None = None,
+    limit: int = 10,
+) -> dict[str, list[InsiderTrade]]:
+    """Fetch insider trades for several tickers concurrently."""
+    return _fan_out(get_insider_trades, tickers, end_date, start_date, limit, default=[])
+
+
+def _fetch_quote_chunk(symbols: str) -> dict[str, float]:
+    """Fetch market caps for comma-separated symbols with a single quote request."""
+    # yfinance's fetcher supplies the cookie and crumb the quote endpoint requires
+    data = _with_retry(
+        lambda: yf.data.YfData(session=_SESSION).get_raw_json(_QUOTE_URL, params={"symbols": symbols, "fields": "marketCap"}),
+        f"quotes for {symbols}",
+    )
+    return {quote["symbol"]: float(quote["marketCap"]) for quote in data["quoteResponse"]["result"] if quote.get("marketCap")}
+
+
+def get_market_cap_batch(tickers: list[str], end_date: str) -> dict[str, float | None]:
+    """Fetch market capitalization for several tickers.
+
+    Market caps come from Yahoo's quote endpoint, _SYMBOLS_PER_REQUEST symbols per request,
+    instead of downloading the full info of every ticker. Tickers the quote endpoint
+    doesn't cover fall back to get_market_cap.
+    """
+    chunks = [",".join(tickers[i:i + _SYMBOLS_PER_REQUEST]) for i in range(0, len(tickers), _SYMBOLS_PER_REQUEST)]
+    results = dict.fromkeys(tickers)
+    try:
+        for market_caps in _fan_out(_fetch_quote_chunk, chunks, default={}).values():
+            results.update((ticker, market_caps[ticker]) for ticker in tickers if ticker in market_caps)
+    except Exception as e:
+        logger.warning("Error fetching batch market caps from Yahoo Finance for %s: %s", tickers, e)
+
+    if missing := [ticker for ticker, market_cap in results.items() if market_cap is None]:
+        results.update(_fan_out(get_market_cap, missing, end_date))
+    return results
+
+
+async def _gather_async(fn, tickers: list[str], *args, concurrency: int = _ASYNC_CONCURRENCY) -> dict:
+    """Await fn(ticker, *args) for every ticker on worker threads, at most `concurrency` at a time."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(ticker: str):
+        async with semaphore:
+            return await asyncio.to_thread(fn, ticker, *args)
+
+    return dict(zip(tickers, await asyncio.gather(*(one(ticker) for ticker in tickers))))
+
+
+async def get_financial_metrics_async(
+    tickers: list[str],
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+) -> dict[str, list[FinancialMetrics]]:
+    """Fetch financial metrics for several tickers without blocking the event loop."""
+    return await _gather_async(get_financial_metrics, tickers, end_date, period, limit)
+
+
+async def get_company_news_async(
+    tickers: list[str],
+    end_date: str,
+    start_date: str | None = None,
+    limit: int = 10,
+) -> dict[str, list[CompanyNews]]:
+    """Fetch company news for several tickers without blocking the event loop."""
+    return await _gather_async(get_company_news, tickers, end_date, start_date, limit)
+
+
+async def search_line_items_async(
+    tickers: list[str],
+    line_items: list[str],
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+) -> dict[str, list[LineItem]]:
+    """Fetch financial line items for several tickers without blocking the event loop."""
+    return await _gather_async(search_line_items, tickers, line_items, end_date, period, limit)
+
+
+async def get_market_cap_async(tickers: list[str], end_date: str) -> dict[str, float | None]:
+    """Fetch market capitalization for several tickers without blocking the event loop."""
+    return await _gather_async(get_market_cap, tickers, end_date)
@@ -3,14 +3,25 @@ Comprehensive test script for Yahoo Finance integration.
 This script tests all the financial data retrieval functionality
 that has been implemented using the Yahoo Finance API.
 """
+import asyncio
+import io
+import json
+import multiprocessing
 import os
+import re
 import sys
 import datetime
+import functools
+import contextlib
+import hashlib
+import itertools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 import pandas as pd
-import yfinance as yf
-import traceback
+from pydantic import BaseModel, TypeAdapter
 # Import directly from the router to ensure we're testing the routing functionality
 from src.tools.api import get_prices, get_financial_metrics, get_company_news, search_line_items, get_insider_trades, _using_yahoo_finance
+from src.data.cache import DiskCache
 from src.data.models import (
     CompanyNews, CompanyNewsResponse,
     Price, PriceResponse,
@@ -20,6 +31,7 @@ from src.data.models import (
 )
 # Import the Yahoo Finance implementation directly for comparison testing
 import src.tools.api_yfinance as api_yfinance
+from yfinance import const as yf_const, utils as yf_utils
 
 # Set up basic logging
 import logging
@@ -29,41 +41,136 @@ logging.basicConfig(level=logging.INFO)
 os.environ["FINANCIAL_DATASETS_API_KEY"] = "yahoo-finance-api"
 
 # Verify that our implementation correctly detects Yahoo Finance API
-assert _using_yahoo_finance() == True, "Yahoo Finance detection failed. Set FINANCIAL_DATASETS_API_KEY to 'yahoo-finance-api' in .env file and try again."
+USING_YF = _using_yahoo_finance()
+assert USING_YF, "Yahoo Finance detection failed. Set FINANCIAL_DATASETS_API_KEY to 'yahoo-finance-api' in .env file and try again."
 logging.info("Yahoo Finance API detection successful")
 
 # Now the API module will use the api_yfinance implementation
 
-# Test ticker
+# Default test ticker, and the default list for the tests that span tickers. The tests take
+# these as arguments, so they can run for other tickers and date ranges side by side
 ticker = "AAPL"
+tickers = (ticker,)
 
-# Test date range
+# Line items requested by test_line_items and test_api_compatibility
+LINE_ITEMS = ["revenue", "net_income", "total_assets", "total_equity", "free_cash_flow", "operating_cash_flow"]
+
+# Shape of a YYYY-MM-DD date string, compiled once for the vectorized checks
+DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# Default test date range
 start_date = "2024-01-01"
-end_date = datetime.datetime.now().strftime("%Y-%m-%d")
+today = datetime.date.today()
+end_date = today.isoformat()
+
+# Most tests to run at once; more parallel requests than this tend to get rate limited by Yahoo
+MAX_CONCURRENT_TESTS = 8
+
+# Responses are kept on disk for a while so repeated runs don't refetch them; --no-cache turns this off
+use_disk_cache = True
+_response_cache = DiskCache("test_yahoo", max_age=24 * 3600)  # entries expire by day or hour
+
+def disk_cached(fn, period="%Y-%m-%d"):
+    """Memoize fn's non-empty results on disk, keyed by its arguments and the current
+    period (formatted with the strftime pattern `period`), so entries expire when it ends"""
+    @functools.wraps(fn)
+    def wrapper(*args):
+        if not use_disk_cache:
+            return fn(*args)
+        key = hashlib.md5(repr(args).encode()).hexdigest()
+        now = datetime.datetime.now().strftime(period)
+        result = _response_cache.get(fn.__name__, key, now)
+        if result is not None:
+            logging.info("Serving %s%s from cache", fn.__name__, args)
+            return result
+        logging.info("Making API call for %s%s", fn.__name__, args)
+        result = fn(*args)
+        if result:
+            _response_cache.set(fn.__name__, key, now, value=result)
+        return result
+    return wrapper
+
+# Statements, prices and insider history are kept for the day; news changes faster, so only for the hour
+get_prices = disk_cached(get_prices)
+get_financial_metrics = disk_cached(get_financial_metrics)
+get_company_news = disk_cached(get_company_news, period="%Y-%m-%dT%H")
+search_line_items = disk_cached(search_line_items)
+get_insider_trades = disk_cached(get_insider_trades)
+get_market_cap = disk_cached(api_yfinance.get_market_cap)
+
+# Results already fetched during this run, so test_api_compatibility reuses what the
+# individual tests just retrieved instead of asking Yahoo Finance for it again
+_RESULT_CACHE: dict = {}
+_RESULT_LOCK = threading.Lock()
+
+def memo(fn, *args):
+    """Call fn(*args) once per run; concurrent callers with the same arguments wait for the first call"""
+    key = (fn.__name__, repr(args))
+    with _RESULT_LOCK:
+        future = _RESULT_CACHE.get(key)
+        owner = future is None
+        if owner:
+            future = _RESULT_CACHE[key] = Future()
+    if owner:
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+    return future.result()
+
+@functools.cache
+def list_adapter(model):
+    """TypeAdapter for list[model], built once per model"""
+    return TypeAdapter(list[model])
+
+def validate_records(model, records):
+    """Validate records as a list of model in one bulk call. The API may build them without
+    validation, and response models accept existing instances as-is, so check the field values here"""
+    return list_adapter(model).validate_python([record.model_dump() for record in records])
+
+class CompatBundle(BaseModel):
+    """The responses test_api_compatibility builds, so they serialize in one call"""
+    prices: PriceResponse
+    metrics: FinancialMetricsResponse
+    news: CompanyNewsResponse
+    lines: LineItemResponse
+    insider: InsiderTradeResponse
+
+def assert_date_format(dates, fmt, label, exact=True):
+    """Assert every date string matches fmt, parsing them all in one vectorized call"""
+    try:
+        pd.to_datetime(list(dates), format=fmt, exact=exact, errors="raise")
+    except ValueError as e:
+        raise AssertionError(f"{label} format should be {fmt}: {e}") from e
 
-def test_prices():
+def get_ticker(sym):
+    """The yf.Ticker api_yfinance uses for this symbol today (memoized there), so the
+    tests share its session, cookie/crumb and already-fetched data instead of starting over"""
+    return api_yfinance._ticker(sym, api_yfinance._today())
+
+def test_prices(ticker=ticker, start_date=start_date, end_date=end_date):
     """Test the Yahoo Finance price data retrieval"""
     print("\nTesting get_prices:")
     try:
-        prices = get_prices(ticker, start_date, end_date)
+        prices = memo(get_prices, ticker, start_date, end_date)
         print(f"Successfully retrieved {len(prices)} price records")
         if not prices:
             print("⚠️ WARNING: No price data retrieved for the given ticker and date range.")
             return False
 
         # Validate that price objects follow the Price model structure
-        for price in prices:
-            assert isinstance(price, Price), "Price data should be returned as Price objects"
-            # Validate required fields
-            assert hasattr(price, "open") and price.open is not None, "Price should have 'open' field"
-            assert hasattr(price, "close") and price.close is not None, "Price should have 'close' field"
-            assert hasattr(price, "high") and price.high is not None, "Price should have 'high' field"
-            assert hasattr(price, "low") and price.low is not None, "Price should have 'low' field"
-            assert hasattr(price, "volume") and price.volume is not None, "Price should have 'volume' field"
-            assert hasattr(price, "time") and price.time is not None, "Price should have 'time' field"
+        required = ["open", "close", "high", "low", "volume", "time"]
+        assert set(required).issubset(Price.model_fields), f"Price model should define {required}"
+        assert all(isinstance(price, Price) for price in prices), "Price data should be returned as Price objects"
+
+        # Validate required fields have values and dates are YYYY-MM-DD, in vectorized checks over all records
+        df = pd.DataFrame([price.__dict__ for price in prices], columns=required)
+        missing = df.isna().any()
+        assert not missing.any(), f"Prices should have values for {list(missing[missing].index)}"
+        assert df["time"].str.fullmatch(DATE_RE).all(), "Price time format should be YYYY-MM-DD"
 
         print(f"Price data format validation successful!")
-        print(f"Sample price data: {prices[0].model_dump()}")
+        print(f"Sample price data: {prices[0].model_dump_json()}")
         return True
     except AssertionError as ae:
         print(f"❌ Format validation failed: {ae}")
@@ -72,38 +179,55 @@ def test_prices():
         print(f"Error in get_prices: {e}")
         return False
 
-def test_financial_metrics():
+def test_prices_batch(tickers=tickers, start_date=start_date, end_date=end_date):
+    """Test fetching prices for all tickers with batched Yahoo Finance downloads"""
+    print(f"\nTesting get_prices_batch for {', '.join(tickers)}:")
+    try:
+        prices_by_ticker = api_yfinance.get_prices_batch(tickers, start_date, end_date)
+        assert set(prices_by_ticker) == set(tickers), "Should return an entry for every requested ticker"
+
+        missing = [sym for sym, prices in prices_by_ticker.items() if not prices]
+        for sym, prices in prices_by_ticker.items():
+            print(f"{sym}: {len(prices)} price records")
+            assert all(isinstance(price, Price) for price in prices), f"{sym} prices should be Price objects"
+        if missing:
+            print(f"⚠️ WARNING: No price data retrieved for {', '.join(missing)}")
+            return False
+
+        print("Batch price data validation successful!")
+        return True
+    except AssertionError as ae:
+        print(f"❌ Format validation failed: {ae}")
+        return False
+    except Exception as e:
+        print(f"Error in get_prices_batch: {e}")
+        return False
+
+def test_financial_metrics(ticker=ticker, start_date=start_date, end_date=end_date):
     """Test the Yahoo Finance financial metrics retrieval"""
     print("\nTesting get_financial_metrics:")
     try:
-        metrics = get_financial_metrics(ticker, end_date)
+        metrics = memo(get_financial_metrics, ticker, end_date)
         print(f"Successfully retrieved {len(metrics)} financial metrics records")
         if not metrics:
             print("⚠️ WARNING: No financial metrics data retrieved for the given ticker and date range.")
             return False
 
         # Validate that financial metrics objects follow the FinancialMetrics model structure
-        for metric in metrics:
-            assert isinstance(metric, FinancialMetrics), "Metrics data should be returned as FinancialMetrics objects"
-            # Validate required fields
-            assert hasattr(metric, "ticker") and metric.ticker is not None, "Metric should have 'ticker' field"
-            assert hasattr(metric, "report_period") and metric.report_period is not None, "Metric should have 'report_period' field"
-            assert hasattr(metric, "period") and metric.period is not None, "Metric should have 'period' field"
-            assert hasattr(metric, "currency") and metric.currency is not None, "Metric should have 'currency' field"
-
-            # Key financial metrics should be present (even if they might be None)
-            assert hasattr(metric, "market_cap"), "Metric should have 'market_cap' field"
-            assert hasattr(metric, "enterprise_value"), "Metric should have 'enterprise_value' field"
-            assert hasattr(metric, "price_to_earnings_ratio"), "Metric should have 'price_to_earnings_ratio' field"
+        required = ["ticker", "report_period", "period", "currency"]
+        # Key financial metrics should be present (even if they might be None)
+        key_metrics = ["market_cap", "enterprise_value", "price_to_earnings_ratio"]
+        assert set(required + key_metrics).issubset(FinancialMetrics.model_fields), f"FinancialMetrics model should define {required + key_metrics}"
+        assert all(isinstance(metric, FinancialMetrics) for metric in metrics), "Metrics data should be returned as FinancialMetrics objects"
+
+        # Validate required fields have values, in one vectorized check over all records
+        missing = pd.DataFrame([metric.__dict__ for metric in metrics], columns=required).isna().any()
+        assert not missing.any(), f"Metrics should have values for {list(missing[missing].index)}"
 
         print(f"Financial metrics data format validation successful!")
 
         # Print a subset of metrics
-        sample_metrics = {
-            "market_cap": metrics[0].market_cap,
-            "price_to_earnings_ratio": metrics[0].price_to_earnings_ratio,
-            "price_to_book_ratio": metrics[0].price_to_book_ratio
-        }
+        sample_metrics = metrics[0].model_dump_json(include={"market_cap", "price_to_earnings_ratio", "price_to_book_ratio"})
         print(f"Sample metrics: {sample_metrics}")
         return True
     except AssertionError as ae:
@@ -113,11 +237,11 @@ def test_financial_metrics():
         print(f"Error in get_financial_metrics: {e}")
         return False
 
-def test_company_news():
+def test_company_news(ticker=ticker, start_date=start_date, end_date=end_date):
     """Test the Yahoo Finance company news retrieval using API"""
     print("\nTesting get_company_news (via API):")
     try:
-        news = get_company_news(ticker, end_date, start_date)
+        news = memo(get_company_news, ticker, end_date, start_date)
         print(f"Retrieved {len(news)} news records from API")
 
         # Fail the test if no news was retrieved
@@ -126,19 +250,16 @@ def test_company_news():
             return False
 
         # Print sample news items
-        has_valid_items = True
-        for i, item in enumerate(news[:3]):  # Show up to 3 items
-            print(f"\nNews {i+1}:")
-            print(f"Title: {item.title}")
-            print(f"Date: {item.date}")
-            print(f"Source: {item.source}")
-
-            # Check if the item has required fields
-            if not item.title or not item.date:
-                print(f"Warning: News item {i+1} has missing or empty required fields")
-                has_valid_items = False
-
-        if not has_valid_items:
+        sample = news[:3]  # Show up to 3 items
+        print("\n".join(
+            f"\nNews {i+1}:\nTitle: {item.title}\nDate: {item.date}\nSource: {item.source}"
+            for i, item in enumerate(sample)
+        ))
+
+        # Check that the items have the required fields
+        invalid = [i+1 for i, item in enumerate(sample) if not item.title or not item.date]
+        if invalid:
+            print("\n".join(f"Warning: News item {i} has missing or empty required fields" for i in invalid))
             print("❌ FAILED: News items are missing required fields")
             return False
 
@@ -147,45 +268,67 @@ def test_company_news():
         print(f"Error in get_company_news: {e}")
         return False
 
-def test_direct_news():
-    """Test direct Yahoo Finance news retrieval"""
-    print("\nTesting direct Yahoo Finance news access:")
+def test_company_news_batch(tickers=tickers, start_date=start_date, end_date=end_date):
+    """Test fetching news for all tickers concurrently"""
+    print(f"\nTesting get_company_news_batch for {', '.join(tickers)}:")
     try:
-        ticker_obj = yf.Ticker(ticker)
-        news_data = ticker_obj.news
+        news_by_ticker = api_yfinance.get_company_news_batch(tickers, end_date, start_date)
+        assert set(news_by_ticker) == set(tickers), "Should return an entry for every requested ticker"
+
+        missing = [sym for sym, news in news_by_ticker.items() if not news]
+        for sym, news in news_by_ticker.items():
+            print(f"{sym}: {len(news)} news records")
+            assert all(isinstance(item, CompanyNews) for item in news), f"{sym} news should be CompanyNews objects"
+        if missing:
+            print(f"❌ FAILED: No news data retrieved for {', '.join(missing)}")
+            return False
 
-        print(f"Found {len(news_data)} news items directly from Yahoo Finance")
+        return True
+    except AssertionError as ae:
+        print(f"❌ Format validation failed: {ae}")
+        return False
+    except Exception as e:
+        print(f"Error in get_company_news_batch: {e}")
+        return False
 
-        # Fail if no news data was found
-        if not news_data:
-            print("❌ FAILED: No news data retrieved directly from Yahoo Finance")
-            return False
+async def fetch_direct_news(symbols):
+    """Read each symbol's Ticker.news on worker threads, all at once, so several
+    tickers take about as long as the slowest one"""
+    return await asyncio.gather(*(asyncio.to_thread(lambda sym=sym: get_ticker(sym).news) for sym in symbols))
 
-        all_news = []
-        has_valid_items = True
+def test_direct_news(tickers=tickers, start_date=start_date, end_date=end_date, news_sample=None):
+    """Test direct Yahoo Finance news retrieval, converting and validating the first
+    news_sample raw items per ticker (all of them when None)"""
+    print("\nTesting direct Yahoo Finance news access:")
+    try:
+        news_by_ticker = dict(zip(tickers, asyncio.run(fetch_direct_news(tickers))))
+        print("\n".join(f"Found {len(news_data)} news items directly from Yahoo Finance for {sym}" for sym, news_data in news_by_ticker.items()))
 
-        # Process each news item
-        for item in news_data:
-            # Get title with fallback default
-            title = item.get('title')
-            if not title:
-                title = f"News for {ticker} on {datetime.datetime.now().strftime('%Y-%m-%d')}"
-                has_valid_items = False
+        # Fail if no news data was found
+        if missing := [sym for sym, news_data in news_by_ticker.items() if not news_data]:
+            print(f"❌ FAILED: No news data retrieved directly from Yahoo Finance for {', '.join(missing)}")
+            return False
 
-            news = CompanyNews(
-                ticker=ticker,
-                title=title,
+        # Build the news items in one pass, using the current time as the date and a default
+        # title where one is missing, then validate them all in one bulk call
+        now = datetime.datetime.now().isoformat(timespec="seconds")
+        all_news = validate_records(CompanyNews, [
+            CompanyNews.model_construct(
+                ticker=sym,
+                title=item.get('title') or f"News for {sym} on {end_date}",
                 author=item.get('publisher', 'Unknown'),
                 source=item.get('publisher', 'Yahoo Finance'),
-                date=datetime.datetime.now().strftime("%Y-%m-%dT%H:%M:%S"),  # Use current date
+                date=now,
                 url=item.get('link', ''),
                 sentiment=None
             )
-            all_news.append(news)
+            for sym, news_data in news_by_ticker.items() for item in itertools.islice(news_data, news_sample)
+        ])
+        has_valid_items = all(item.get('title') for news_data in news_by_ticker.values() for item in itertools.islice(news_data, news_sample))
 
         print(f"Processed {len(all_news)} news items")
         if all_news:
-            print(f"Sample news: {all_news[0].model_dump()}")
+            print(f"Sample news: {all_news[0].model_dump_json()}")
 
         # Only fail if we have no valid items at all
         if not has_valid_items:
@@ -196,18 +339,21 @@ def test_direct_news():
         print(f"Error in direct news access: {e}")
         return False
 
-def test_line_items():
-    """Test the Yahoo Finance line items retrieval"""
+def test_line_items(ticker=ticker, start_date=start_date, end_date=end_date, verbose=False):
+    """Test the Yahoo Finance line items retrieval, printing every item when verbose"""
     print("\nTesting search_line_items:")
     try:
         # Test with common financial metrics across different statements
-        line_items = ["revenue", "net_income", "total_assets", "total_equity", "free_cash_flow", "operating_cash_flow"]
-        results = search_line_items(ticker, line_items, end_date)
+        line_items = LINE_ITEMS
+        results = memo(search_line_items, ticker, line_items, end_date)
         print(f"Retrieved {len(results)} line items")
 
-        # Display items if available
-        for item in results:
-            print(f"Item: {item.model_dump()}")
+        # Display a sample item, or all of them with --verbose
+        if results:
+            print("\n".join(f"Item: {item.model_dump_json()}" for item in (results if verbose else results[:1])))
+
+        # Check date format - should be YYYY-MM-DD
+        assert_date_format([item.report_period for item in results if item.report_period], "%Y-%m-%d", "Report period")
 
         # Validate each item has the required fields from LineItem model
         for item in results:
@@ -217,19 +363,15 @@ def test_line_items():
             assert isinstance(item.period, str), "Period should be a string"
             assert isinstance(item.currency, str), "Currency should be a string"
 
-            # Check date format - should be YYYY-MM-DD
-            if item.report_period:
-                date_format = item.report_period
-                assert len(date_format) == 10 and date_format[4] == '-' and date_format[7] == '-', \
-                    f"Report period format should be YYYY-MM-DD, got {date_format}"
-
-            # Verify at least one of the requested line items is present in the response
+            # Verify at least one of the requested line items is present in the response;
+            # requested items are extra fields, so read them from one model_dump() dict
+            values = item.model_dump()
             found_items = False
             for line_item in line_items:
-                if hasattr(item, line_item) and getattr(item, line_item) is not None:
+                if values.get(line_item) is not None:
                     found_items = True
                     # Check that the value is a float
-                    assert isinstance(getattr(item, line_item), float), f"{line_item} should be a float"
+                    assert isinstance(values[line_item], float), f"{line_item} should be a float"
                     break
 
             if not found_items and results:
@@ -248,7 +390,46 @@ def test_line_items():
         print(f"Error in search_line_items: {e}")
         return False
 
-def test_insider_trades():
+def test_statement_rows(ticker=ticker, start_date=start_date, end_date=end_date):
+    """Offline check that line items map to the row labels yfinance's statements use,
+    deriving metrics from stub statement frames that carry those labels"""
+    print("\nTesting statement row labels (offline):")
+    try:
+        # The labels yfinance's financials, balance_sheet and cashflow properties can return
+        labels = {
+            "income": yf_utils.camel2title(yf_const.fundamentals_keys["financials"], sep=" ", acronyms=["EBIT", "EBITDA", "EPS", "NI"]),
+            "balance": yf_utils.camel2title(yf_const.fundamentals_keys["balance-sheet"], sep=" ", acronyms=["PPE"]),
+            "cash_flow": yf_utils.camel2title(yf_const.fundamentals_keys["cash-flow"], sep=" ", acronyms=["PPE"]),
+        }
+        mapping = api_yfinance._LINE_ITEM_TO_STATEMENT
+        unknown = [item for item, (row, statement_id) in mapping.items() if row not in labels[statement_id]]
+        assert not unknown, f"Line items mapped to rows yfinance doesn't return: {unknown}"
+
+        # Stub statements with two yearly reports holding every mapped row
+        report_dates = pd.to_datetime(["2024-09-30", "2023-09-30"])
+        rows_by_statement = {}
+        for row, statement_id in mapping.values():
+            rows_by_statement.setdefault(statement_id, {})[row] = [120.0, 100.0]
+        statements = {
+            statement_id: pd.DataFrame.from_dict(rows, orient="index", columns=report_dates)
+            for statement_id, rows in rows_by_statement.items()
+        }
+
+        derived = api_yfinance._metrics_from_statements(statements, {"marketCap": 1200.0, "sharesOutstanding": 10.0}, "2024-12-31")
+        missing = [field for field, value in derived.items() if value is None]
+        assert not missing, f"Metrics should be derived from the stub statements: {missing}"
+        assert abs(derived["revenue_growth"] - 0.2) < 1e-9, f"Revenue growth should be 0.2, got {derived['revenue_growth']}"
+
+        print(f"All {len(mapping)} line items map to yfinance rows; derived {len(derived)} metrics from stub statements")
+        return True
+    except AssertionError as ae:
+        print(f"❌ Statement row validation failed: {ae}")
+        return False
+    except Exception as e:
+        print(f"Error in statement row check: {e}")
+        return False
+
+def test_insider_trades(ticker=ticker, start_date=start_date, end_date=end_date):
     """Test the Yahoo Finance insider trades retrieval"""
     print("\nTesting get_insider_trades:")
     try:
@@ -263,17 +444,17 @@ def test_insider_trades():
 
         # If we do get data (in future versions), show a sample
         if trades:
-            print(f"Sample trade: {trades[0].model_dump()}")
+            print(f"Sample trade: {trades[0].model_dump_json()}")
         return True
     except Exception as e:
         print(f"Error in get_insider_trades: {e}")
         return False
 
-def test_market_cap():
+def test_market_cap(ticker=ticker, start_date=start_date, end_date=end_date):
     """Test the Yahoo Finance market cap retrieval"""
     print("\nTesting get_market_cap:")
     try:
-        market_cap = api_yfinance.get_market_cap(ticker, end_date)
+        market_cap = memo(get_market_cap, ticker, end_date)
 
         # We can't assert that the market cap is not None since some tickers might not have market cap data
         # Just print the result and check if it makes sense
@@ -293,55 +474,124 @@ def test_market_cap():
         print(f"Error in get_market_cap: {e}")
         return False
 
-def run_all_tests():
+class _PerThreadOutput(io.TextIOBase):
+    """sys.stdout stand-in that sends each thread's prints to its own buffer, if it has one"""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def write(self, text):
+        return getattr(self._local, "buffer", self._stream).write(text)
+
+    def flush(self):
+        self._stream.flush()
+
+    def capture(self, test_fn):
+        """Run a test with its output buffered, returning (result, output)"""
+        self._local.buffer = io.StringIO()
+        try:
+            return test_fn(), self._local.buffer.getvalue()
+        finally:
+            del self._local.buffer
+
+def bind(test_fn, tickers, start_date, end_date, news_sample=None, verbose=False):
+    """test_fn with its arguments filled in: the whole ticker list for the tests that
+    span tickers, otherwise just the first ticker, plus the options it takes"""
+    options = {"news_sample": news_sample, "verbose": verbose}
+    kwargs = {name: options[name] for name in TEST_OPTIONS.get(test_fn, ())}
+    return functools.partial(test_fn, tickers if test_fn in MULTI_TICKER_TESTS else tickers[0], start_date, end_date, **kwargs)
+
+def run_all_tests(tickers=tickers, start_date=start_date, end_date=end_date, news_sample=None, verbose=False):
     """Run all Yahoo Finance integration tests"""
     print("Testing Yahoo Finance Integration")
     print("-" * 50)
 
-    results = {
-        "Prices": test_prices(),
-        "Financial Metrics": test_financial_metrics(),
-        "Company News (API)": test_company_news(),
-        "Direct News Access": test_direct_news(),
-        "Line Items": test_line_items(),
-        "Insider Trades": test_insider_trades(),
-        "Market Cap": test_market_cap(),
-        "API Compatibility": test_api_compatibility()
+    tasks = {
+        "Prices": test_prices,
+        "Financial Metrics": test_financial_metrics,
+        "Company News (API)": test_company_news,
+        "Direct News Access": test_direct_news,
+        "Line Items": test_line_items,
+        "Insider Trades": test_insider_trades,
+        "Market Cap": test_market_cap,
+        "Statement Rows (offline)": test_statement_rows,
+        "API Compatibility": test_api_compatibility
     }
+    if len(tickers) > 1:
+        tasks["Prices (batch)"] = test_prices_batch
+        tasks["Company News (batch)"] = test_company_news_batch
+
+    # The tests are independent and wait on the network, so run them concurrently.
+    # Each test's output is buffered and printed in one piece when it finishes,
+    # so lines from different tests don't interleave.
+    results = dict.fromkeys(tasks)
+    output = _PerThreadOutput(sys.stdout)
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=min(len(tasks), MAX_CONCURRENT_TESTS)) as executor:
+            futures = {
+                executor.submit(output.capture, bind(test_fn, tickers, start_date, end_date, news_sample, verbose)): name
+                for name, test_fn in tasks.items()
+            }
+            for future in as_completed(futures):
+                results[futures[future]], test_output = future.result()
+                print(test_output, end="")
+    finally:
+        sys.stdout = output._stream
 
     print("\nTest Results Summary:")
     print("-" * 50)
-    for test, passed in results.items():
-        status = "✅ PASSED" if passed else "❌ FAILED"
-        print(f"{test}: {status}")
+    print("\n".join(f"{test}: {'✅ PASSED' if passed else '❌ FAILED'}" for test, passed in results.items()))
+
+    print("\nTest complete")
+
+async def async_test_suite(tickers, start_date, end_date):
+    """Fetch prices, news and metrics for all tickers concurrently, so the run takes
+    about as long as the slowest endpoint instead of the sum of all of them"""
+    return await asyncio.gather(
+        asyncio.to_thread(api_yfinance.get_prices_batch, tickers, start_date, end_date),
+        api_yfinance.get_company_news_async(tickers, end_date, start_date),
+        api_yfinance.get_financial_metrics_async(tickers, end_date),
+    )
+
+def run_async_tests(tickers=tickers, start_date=start_date, end_date=end_date):
+    """Run the concurrent price, news and metrics checks for all tickers"""
+    print(f"Testing Yahoo Finance Integration asynchronously for {', '.join(tickers)}")
+    print("-" * 50)
 
-        print("\nTest complete")
+    prices, news, metrics = asyncio.run(async_test_suite(tickers, start_date, end_date))
+    checks = {"Prices": (prices, Price), "Company News": (news, CompanyNews), "Financial Metrics": (metrics, FinancialMetrics)}
+
+    print("\nTest Results Summary:")
+    print("-" * 50)
+    for name, (results, model) in checks.items():
+        passed = all(results[sym] and all(isinstance(x, model) for x in results[sym]) for sym in tickers)
+        counts = ", ".join(f"{sym}: {len(results[sym])}" for sym in tickers)
+        status = "✅ PASSED" if passed else "❌ FAILED"
+        print(f"{name} ({counts}): {status}")
 
-def test_api_compatibility():
+def test_api_compatibility(ticker=ticker, start_date=start_date, end_date=end_date):
     """Test that the Yahoo Finance implementation is compatible with Financial Datasets API"""
     print("\nTesting API compatibility between Yahoo Finance and Financial Datasets API:")
     try:
         # Test Price API compatibility
         print("Testing Price API compatibility:")
-        # Get prices directly from Yahoo Finance implementation
-        yf_prices = api_yfinance.get_prices(ticker, start_date, end_date)
+        # Reuse the prices test_prices fetched from Yahoo Finance
+        yf_prices = memo(get_prices, ticker, start_date, end_date)
 
         # Validate that prices match the expected structure
         print(f"Got {len(yf_prices)} prices from Yahoo Finance API")
 
         # Check that we can construct a valid PriceResponse object
         # This is what the Financial Datasets API would return
-        price_response = PriceResponse(ticker=ticker, prices=yf_prices)
+        price_response = PriceResponse(ticker=ticker, prices=validate_records(Price, yf_prices))
 
         # Validate the structure is correct
         assert isinstance(price_response.ticker, str), "Ticker should be a string"
         assert isinstance(price_response.prices, list), "Prices should be a list"
         assert all(isinstance(p, Price) for p in price_response.prices), "All items in prices should be Price objects"
 
-        # Test that we can serialize/deserialize the response
-        price_response_json = price_response.model_dump_json()
-        print("Successfully serialized price response to JSON")
-
         # Validate a sample price has the expected fields with correct types
         if yf_prices:
             p = yf_prices[0]
@@ -352,17 +602,15 @@ def test_api_compatibility():
             assert isinstance(p.volume, int), "Volume should be an integer"
             assert isinstance(p.time, str), "Time should be a string"
 
-            # Check date format - should be YYYY-MM-DD
-            date_format = p.time
-            assert len(date_format) == 10 and date_format[4] == '-' and date_format[7] == '-', \
-                f"Time format should be YYYY-MM-DD, got {date_format}"
+            # Check date format of every price - should be YYYY-MM-DD
+            assert_date_format([price.time for price in yf_prices], "%Y-%m-%d", "Time")
 
         print("✅ Price API compatibility validation successful!")
 
         # Test Financial Metrics API compatibility
         print("\nTesting Financial Metrics API compatibility:")
-        # Get financial metrics directly from Yahoo Finance implementation
-        yf_metrics = api_yfinance.get_financial_metrics(ticker, end_date, "ttm", 1)
+        # Reuse the financial metrics test_financial_metrics fetched from Yahoo Finance
+        yf_metrics = memo(get_financial_metrics, ticker, end_date)
 
         # Validate that metrics match the expected structure
         print(f"Got {len(yf_metrics)} financial metrics from Yahoo Finance API")
@@ -372,17 +620,13 @@ def test_api_compatibility():
 
         # Check that we can construct a valid FinancialMetricsResponse object
         # This is what the Financial Datasets API would return
-        metrics_response = FinancialMetricsResponse(financial_metrics=yf_metrics)
+        metrics_response = FinancialMetricsResponse(financial_metrics=validate_records(FinancialMetrics, yf_metrics))
 
         # Validate the structure is correct
         assert isinstance(metrics_response.financial_metrics, list), "Financial metrics should be a list"
         assert all(isinstance(m, FinancialMetrics) for m in metrics_response.financial_metrics), \
             "All items should be FinancialMetrics objects"
 
-        # Test that we can serialize/deserialize the response
-        metrics_response_json = metrics_response.model_dump_json()
-        print("Successfully serialized financial metrics response to JSON")
-
         # Validate the financial metrics has the expected fields with correct types
         if yf_metrics:
             m = yf_metrics[0]
@@ -394,10 +638,8 @@ def test_api_compatibility():
             # Market cap should be a float or None
             assert m.market_cap is None or isinstance(m.market_cap, float), "Market cap should be a float or None"
 
-            # Check date format - should be YYYY-MM-DD
-            date_format = m.report_period
-            assert len(date_format) == 10 and date_format[4] == '-' and date_format[7] == '-', \
-                f"Report period format should be YYYY-MM-DD, got {date_format}"
+            # Check date format of every metric - should be YYYY-MM-DD
+            assert_date_format([metric.report_period for metric in yf_metrics], "%Y-%m-%d", "Report period")
 
             # Verify the metrics are structured according to Financial Datasets API
             assert hasattr(m, "price_to_earnings_ratio"), "Should have price_to_earnings_ratio field"
@@ -408,8 +650,8 @@ def test_api_compatibility():
 
         # Test Company News API compatibility
         print("\nTesting Company News API compatibility:")
-        # Get company news directly from Yahoo Finance implementation
-        yf_news = api_yfinance.get_company_news(ticker, end_date, start_date)
+        # Reuse the company news test_company_news fetched from Yahoo Finance
+        yf_news = memo(get_company_news, ticker, end_date, start_date)
 
         # Validate that news match the expected structure
         print(f"Got {len(yf_news)} news items from Yahoo Finance API")
@@ -418,17 +660,13 @@ def test_api_compatibility():
         if len(yf_news) > 0:
             # Check that we can construct a valid CompanyNewsResponse object
             # This is what the Financial Datasets API would return
-            news_response = CompanyNewsResponse(news=yf_news)
+            news_response = CompanyNewsResponse(news=validate_records(CompanyNews, yf_news))
 
             # Validate the structure is correct
             assert isinstance(news_response.news, list), "News should be a list"
             assert all(isinstance(n, CompanyNews) for n in news_response.news), \
                 "All items should be CompanyNews objects"
 
-            # Test that we can serialize/deserialize the response
-            news_response_json = news_response.model_dump_json()
-            print("Successfully serialized company news response to JSON")
-
             # Validate a sample news item has the expected fields with correct types
             n = yf_news[0]
             assert isinstance(n.ticker, str), "Ticker should be a string"
@@ -438,17 +676,15 @@ def test_api_compatibility():
             assert isinstance(n.date, str), "Date should be a string"
             assert isinstance(n.url, str), "URL should be a string"
 
-            # Check date format - should be YYYY-MM-DDThh:mm:ss
-            date_format = n.date
-            assert len(date_format) >= 19 and date_format[4] == '-' and date_format[7] == '-' and date_format[10] == 'T', \
-                f"Date format should be YYYY-MM-DDThh:mm:ss, got {date_format}"
+            # Check date format of every news item - should start with YYYY-MM-DDThh:mm:ss
+            assert_date_format([news.date for news in yf_news], "%Y-%m-%dT%H:%M:%S", "Date", exact=False)
 
             print("✅ Company News API compatibility validation successful!")
         else:
             print("⚠️ No news data available for testing, skipping detailed validation")
             # Even if there's no news, we should still be able to create an empty response
-            empty_response = CompanyNewsResponse(news=[])
-            assert len(empty_response.news) == 0, "Empty news response should have an empty list"
+            news_response = CompanyNewsResponse(news=[])
+            assert len(news_response.news) == 0, "Empty news response should have an empty list"
             print("✅ Empty news response validation successful!")
 
         # Test Line Items API compatibility
@@ -456,8 +692,8 @@ def test_api_compatibility():
         # Define some common line items to test
         test_line_items = ["revenue", "net_income", "total_assets", "free_cash_flow"]
 
-        # Get line items directly from Yahoo Finance implementation
-        yf_line_items = api_yfinance.search_line_items(ticker, test_line_items, end_date, "ttm", 5)
+        # Reuse the line items test_line_items fetched from Yahoo Finance
+        yf_line_items = memo(search_line_items, ticker, LINE_ITEMS, end_date)
 
         # Validate that line items match the expected structure
         print(f"Got {len(yf_line_items)} line items from Yahoo Finance API")
@@ -466,17 +702,13 @@ def test_api_compatibility():
         if len(yf_line_items) > 0:
             # Check that we can construct a valid LineItemResponse object
             # This is what the Financial Datasets API would return
-            line_items_response = LineItemResponse(search_results=yf_line_items)
+            line_items_response = LineItemResponse(search_results=validate_records(LineItem, yf_line_items))
 
             # Validate the structure is correct
             assert isinstance(line_items_response.search_results, list), "Line items should be in a list"
             assert all(isinstance(item, LineItem) for item in line_items_response.search_results), \
                 "All items should be LineItem objects"
 
-            # Test that we can serialize/deserialize the response
-            line_items_response_json = line_items_response.model_dump_json()
-            print("Successfully serialized line items response to JSON")
-
             # Validate a sample line item has the expected fields with correct types
             if yf_line_items:
                 item = yf_line_items[0]
@@ -485,10 +717,8 @@ def test_api_compatibility():
                 assert isinstance(item.period, str), "Period should be a string"
                 assert isinstance(item.currency, str), "Currency should be a string"
 
-                # Check date format - should be YYYY-MM-DD
-                date_format = item.report_period
-                assert len(date_format) == 10 and date_format[4] == '-' and date_format[7] == '-', \
-                    f"Report period format should be YYYY-MM-DD, got {date_format}"
+                # Check date format of every line item - should be YYYY-MM-DD
+                assert_date_format([line_item.report_period for line_item in yf_line_items], "%Y-%m-%d", "Report period")
 
                 # Check that at least one of the requested line items exists in the response
                 found_item = False
@@ -505,8 +735,8 @@ def test_api_compatibility():
         else:
             print("⚠️ No line items data available for testing, skipping detailed validation")
             # Even if there are no line items, we should still be able to create an empty response
-            empty_response = LineItemResponse(search_results=[])
-            assert len(empty_response.search_results) == 0, "Empty line items response should have an empty list"
+            line_items_response = LineItemResponse(search_results=[])
+            assert len(line_items_response.search_results) == 0, "Empty line items response should have an empty list"
             print("✅ Empty line items response validation successful!")
 
         # Test Insider Trades API compatibility
@@ -522,37 +752,41 @@ def test_api_compatibility():
 
         # Check that we can construct a valid InsiderTradeResponse object
         # This is what the Financial Datasets API would return
-        insider_trades_response = InsiderTradeResponse(insider_trades=yf_insider_trades)
+        insider_trades_response = InsiderTradeResponse(insider_trades=validate_records(InsiderTrade, yf_insider_trades))
 
         # Validate the structure is correct
         assert isinstance(insider_trades_response.insider_trades, list), "Insider trades should be in a list"
         assert all(isinstance(trade, InsiderTrade) for trade in insider_trades_response.insider_trades), \
             "All items should be InsiderTrade objects"
 
-        # Test that we can serialize/deserialize the response
-        insider_trades_response_json = insider_trades_response.model_dump_json()
-        print("Successfully serialized insider trades response to JSON")
-
         # If we have insider trades data (unlikely with current yfinance version), validate it
         if len(yf_insider_trades) > 0:
             trade = yf_insider_trades[0]
             assert isinstance(trade.ticker, str), "Ticker should be a string"
             assert isinstance(trade.filing_date, str), "Filing date should be a string"
 
-            # Check date format - should be YYYY-MM-DD
-            date_format = trade.filing_date
-            assert len(date_format) == 10 and date_format[4] == '-' and date_format[7] == '-', \
-                f"Filing date format should be YYYY-MM-DD, got {date_format}"
+            # Check date format of every trade - should be YYYY-MM-DD
+            assert_date_format([trade.filing_date for trade in yf_insider_trades], "%Y-%m-%d", "Filing date")
 
             print("✅ Insider Trades API compatibility validation successful!")
         else:
             print("⚠️ No insider trades data available for testing, skipping detailed validation")
             print("✅ Empty insider trades response validation successful!")
 
+        # Test that we can serialize the responses, in one pass over all of them
+        CompatBundle(
+            prices=price_response,
+            metrics=metrics_response,
+            news=news_response,
+            lines=line_items_response,
+            insider=insider_trades_response,
+        ).model_dump_json()
+        print("Successfully serialized all responses to JSON")
+
         # Test Market Cap API compatibility
         print("\nTesting Market Cap API compatibility:")
-        # Get market cap directly from Yahoo Finance implementation
-        yf_market_cap = api_yfinance.get_market_cap(ticker, end_date)
+        # Reuse the market cap test_market_cap fetched from Yahoo Finance
+        yf_market_cap = memo(get_market_cap, ticker, end_date)
 
         print(f"Got market cap from Yahoo Finance API: {yf_market_cap}")
 
@@ -574,43 +808,109 @@ def test_api_compatibility():
         print(f"Error in API compatibility test: {e}")
         return False
 
-def run_single_test(test_name):
+# Tests selectable with --test
+TEST_MAPPING = {
+    "prices": test_prices,
+    "metrics": test_financial_metrics,
+    "news": test_company_news,
+    "direct_news": test_direct_news,
+    "line_items": test_line_items,
+    "insider": test_insider_trades,
+    "market_cap": test_market_cap,
+    "statement_rows": test_statement_rows,
+    "compatibility": test_api_compatibility,
+    "prices_batch": test_prices_batch,
+    "news_batch": test_company_news_batch
+}
+
+# Tests that take the whole ticker list rather than a single ticker
+MULTI_TICKER_TESTS = {test_direct_news, test_prices_batch, test_company_news_batch}
+
+# Command-line options (--sample, --verbose) that some tests take as keyword arguments
+TEST_OPTIONS = {test_direct_news: ("news_sample",), test_line_items: ("verbose",)}
+
+def run_single_test(test_name, tickers=tickers, start_date=start_date, end_date=end_date, news_sample=None, verbose=False):
     """Run a specific test by name"""
-    test_mapping = {
-        "prices": test_prices,
-        "metrics": test_financial_metrics,
-        "news": test_company_news,
-        "direct_news": test_direct_news,
-        "line_items": test_line_items,
-        "insider": test_insider_trades,
-        "market_cap": test_market_cap,
-        "compatibility": test_api_compatibility
-    }
-
-    if test_name not in test_mapping:
-        print(f"Error: Unknown test '{test_name}'")
-        print(f"Available tests: {', '.join(test_mapping.keys())}")
-        return
-
     print(f"Running test: {test_name}")
-    result = test_mapping[test_name]()
+    result = bind(TEST_MAPPING[test_name], tickers, start_date, end_date, news_sample, verbose)()
     status = "✅ PASSED" if result else "❌ FAILED"
     print(f"Test result: {status}")
 
+def _init_matrix_worker(disk_cache):
+    """Carry --no-cache into a worker process, which doesn't see the parent's module
+    state when it is spawned rather than forked"""
+    global use_disk_cache
+    use_disk_cache = disk_cache
+
+def _matrix_worker(sym, test_name, start_date, end_date, results_dir, news_sample, verbose):
+    """Run one test for one ticker in a worker process and write its outcome to
+    results_dir/<ticker>/<test>.json, unless an earlier run already did"""
+    path = os.path.join(results_dir, sym, f"{test_name}.json")
+    if os.path.exists(path):
+        return
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        passed = bind(TEST_MAPPING[test_name], [sym], start_date, end_date, news_sample, verbose)()
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"ticker": sym, "test": test_name, "passed": passed, "output": output.getvalue()}, f, indent=2)
+
+def run_matrix(tickers=tickers, start_date=start_date, end_date=end_date, results_dir="results", news_sample=None, verbose=False):
+    """Run every single-ticker test for every ticker, one (ticker, test) pair per worker process.
+    Pairs whose result file already exists are skipped, so an interrupted sweep can be resumed"""
+    test_names = [name for name in TEST_MAPPING if not name.endswith("_batch")]
+    jobs = list(itertools.product(tickers, test_names))
+    print(f"Running {len(test_names)} tests for {len(tickers)} tickers into {results_dir}/")
+
+    # Workers are capped like run_all_tests, since Yahoo rate limits the requests, not the CPU
+    with multiprocessing.Pool(min(MAX_CONCURRENT_TESTS, len(jobs)), initializer=_init_matrix_worker, initargs=(use_disk_cache,)) as pool:
+        pending = [
+            pool.apply_async(_matrix_worker, (sym, test_name, start_date, end_date, results_dir, news_sample, verbose), error_callback=print)
+            for sym, test_name in jobs
+        ]
+        for result in pending:
+            result.wait()
+
+    print("\nTest Results Summary:")
+    print("-" * 50)
+    for sym in tickers:
+        statuses = []
+        for test_name in test_names:
+            try:
+                with open(os.path.join(results_dir, sym, f"{test_name}.json")) as f:
+                    passed = json.load(f)["passed"]
+            except (OSError, ValueError, KeyError):
+                passed = False
+            statuses.append(f"{test_name} {'✅' if passed else '❌'}")
+        print(f"{sym}: {', '.join(statuses)}")
+
 if __name__ == "__main__":
     import argparse
 
     parser = argparse.ArgumentParser(description='Test Yahoo Finance API integration')
-    parser.add_argument('--test', type=str, help='Run a specific test (prices, metrics, news, direct_news, line_items, insider, market_cap)')
-    parser.add_argument('--ticker', type=str, default="AAPL", help='Ticker symbol to test with')
+    parser.add_argument('--test', type=str, choices=list(TEST_MAPPING), help='Run a specific test')
+    parser.add_argument('--ticker', type=str, default="AAPL", help='Ticker symbol to test with, or a comma-separated list (e.g. AAPL,MSFT,GOOG) to also run the batch tests')
+    parser.add_argument('--async', dest='run_async', action='store_true', help='Fetch prices, news and metrics for all tickers concurrently')
+    parser.add_argument('--matrix', action='store_true', help='Run every test for every ticker in worker processes, writing results/<ticker>/<test>.json')
+    parser.add_argument('--results-dir', type=str, default="results", help='Where --matrix writes its results')
+    parser.add_argument('--sample', type=int, help='Only convert and validate the first N raw news items per ticker in the direct news test')
+    parser.add_argument('--verbose', action='store_true', help='Print every retrieved line item instead of a sample')
+    parser.add_argument('--no-cache', action='store_true', help='Always fetch from Yahoo Finance instead of reusing today\'s cached responses')
     args = parser.parse_args()
 
-    # Override the global ticker if specified
-    if args.ticker:
-        ticker = args.ticker
-        print(f"Using ticker: {ticker}")
+    if args.no_cache:
+        use_disk_cache = False
+
+    selected = [sym.strip().upper() for sym in args.ticker.split(",") if sym.strip()] or list(tickers)
+    print(f"Using ticker: {', '.join(selected)}")
 
-    if args.test:
-        run_single_test(args.test)
+    if args.matrix:
+        run_matrix(selected, results_dir=args.results_dir, news_sample=args.sample, verbose=args.verbose)
+    elif args.run_async:
+        run_async_tests(selected)
+    elif args.test:
+        run_single_test(args.test, selected, news_sample=args.sample, verbose=args.verbose)
     else:
-        run_all_tests()
+        run_all_tests(selected, news_sample=args.sample, verbose=args.verbose)